@@ -0,0 +1,145 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from email.utils import format_datetime, parsedate_to_datetime
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from app.serialization import dumps
+
+class CachedResponse:
+    """Готовое тело ответа и его валидаторы"""
+
+    def __init__(self, body: bytes, last_modified=None):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.last_modified = last_modified
+        self.created = time.monotonic()
+        self.headers = {
+            "ETag": self.etag,
+            # Клиент каждый раз перепроверяет ответ и получает 304, если ничего не менялось
+            "Cache-Control": "no-cache",
+        }
+        if last_modified is not None:
+            self.headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    def not_modified(self, request: Request) -> bool:
+        """Проверяет условные заголовки If-None-Match / If-Modified-Since"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return if_none_match.strip() == "*" or self.etag in [
+                tag.strip() for tag in if_none_match.split(",")
+            ]
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+class ResponseCache:
+    """Кэш сериализованных ответов со списками мест.
+
+    Сбрасывается целиком при создании места. Пока кэш актуален, повторный
+    запрос не обращается к БД и не сериализует данные, а запрос с совпавшим
+    ETag получает 304. Другие процессы uvicorn сбрасывают свои копии по
+    NOTIFY (PlaceHub, on_change); ttl лишь страховка на случай пропущенного
+    уведомления и должен быть заметно больше 30-секундного опроса клиентов,
+    иначе каждый опрос снова идет в БД.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Сбрасывает все сохраненные ответы"""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.created > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, entry: CachedResponse, version: int):
+        with self._lock:
+            # Ответ, собранный до сброса кэша, может быть устаревшим
+            if version != self._version:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def respond(self, request: Request, build) -> Response:
+        """Отдает ответ из кэша или строит его вызовом build().
+
+        build() возвращает корутину, которая дает (данные, last_modified).
+        """
+        key = request.url.path + "?" + urlencode(sorted(request.query_params.multi_items()))
+        entry = self._get(key)
+        if entry is None:
+            version = self._version
+            data, last_modified = await build()
+            body = dumps(data)
+            entry = CachedResponse(body, last_modified)
+            self._put(key, entry, version)
+
+        if entry.not_modified(request):
+            return Response(status_code=304, headers=entry.headers)
+        return Response(content=entry.body, media_type="application/json", headers=entry.headers)
+
+class TTLCache:
+    """Небольшой LRU-кэш значений с временем жизни в памяти процесса"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, created)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Возвращает значение или None, если его нет или оно устарело"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, created = entry
+            if time.monotonic() - created > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+def last_modified_of(places):
+    """Время последнего изменения среди мест (по updated_at или created_at)"""
+    return max(
+        (place.updated_at or place.created_at for place in places
+         if (place.updated_at or place.created_at) is not None),
+        default=None,
+    )
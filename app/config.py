@@ -1,5 +1,21 @@
 from pydantic_settings import BaseSettings
 
+class ProfilingSettings(BaseSettings):
+    """Профилирование SQL (app/profiling.py): число команд и время в БД на запрос,
+    лог медленных команд с EXPLAIN. Выключено - накладных расходов нет.
+
+    Отдельно от Settings: эти настройки читают все приложения (app.main,
+    app.main_auth_*), в том числе запущенные без обязательных настроек БД.
+    Переменные окружения: PROFILE_QUERIES, SLOW_QUERY_MS, PROFILE_MAX_QUERIES.
+    """
+    profile_queries: bool = False
+    slow_query_ms: int = 200  # порог медленной команды, мс
+    profile_max_queries: int = 20  # больше команд на запрос - предупреждение в логе
+    
+    class Config:
+        env_file = ".env"
+        extra = "ignore"  # остальные переменные из .env относятся к Settings
+
 class Settings(BaseSettings):
     # База данных
     db_user: str
@@ -7,12 +23,27 @@ class Settings(BaseSettings):
     db_name: str
     db_host: str = "localhost"
     db_port: int = 5432
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_recycle: int = 1800  # секунд
+    db_pool_timeout: int = 30  # секунд
     
     # Приложение
     secret_key: str
     upload_dir: str = "./app/static/uploads"
+    max_upload_size: int = 10 * 1024 * 1024  # байт
     
     class Config:
         env_file = ".env"
+        extra = "ignore"
+
+profiling_settings = ProfilingSettings()
 
-settings = Settings()
\ No newline at end of file
+def __getattr__(name):
+    # settings создается при первом обращении: импорт profiling_settings
+    # не должен требовать обязательных настроек БД
+    if name == "settings":
+        global settings
+        settings = Settings()
+        return settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,15 +1,25 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.config import settings
+from app.config import settings, profiling_settings
+from app.engines import create_engines, async_session_factory
+from app.profiling import profile_engine
 
 # Строка подключения к PostgreSQL
 SQLALCHEMY_DATABASE_URL = f"postgresql://{settings.db_user}:{settings.db_password}@{settings.db_host}:{settings.db_port}/{settings.db_name}"
 
-# Создаем движок
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Создаем движки (синхронный и asyncpg) с общими настройками пула
+engine, async_engine = create_engines(
+    SQLALCHEMY_DATABASE_URL,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    pool_timeout=settings.db_pool_timeout
+)
+if profiling_settings.profile_queries:
+    profile_engine(async_engine, profiling_settings.slow_query_ms)
 
-# Создаем фабрику сессий
+# Создаем фабрики сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_session_factory(async_engine)
 
 # Функция для получения сессии БД
 def get_db():
@@ -17,4 +27,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Функция для получения асинхронной сессии БД
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
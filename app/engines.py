@@ -0,0 +1,41 @@
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+def async_url(url: str) -> str:
+    """postgresql://... -> postgresql+asyncpg://..."""
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+def create_engines(url: str, pool_size: int = 10, max_overflow: int = 20,
+                   pool_recycle: int = 1800, pool_timeout: int = 30):
+    """Создает синхронный (psycopg2) и асинхронный (asyncpg) движки.
+
+    Обработчики запросов работают через асинхронный движок и не занимают
+    потоки, синхронный нужен для create_all и миграций при запуске.
+    pool_pre_ping отбрасывает соединения, закрытые сервером или прокси,
+    pool_recycle пересоздает их раньше, чем сработает idle-таймаут.
+    """
+    pool = _pool_options(pool_size, max_overflow, pool_recycle, pool_timeout)
+    return create_engine(url, **pool), create_async_engine(async_url(url), **pool)
+
+def create_async_only_engine(url: str, pool_size: int = 10, max_overflow: int = 20,
+                             pool_recycle: int = 1800, pool_timeout: int = 30):
+    """Только асинхронный движок - для выгрузок и CLI, которым схема не нужна."""
+    pool = _pool_options(pool_size, max_overflow, pool_recycle, pool_timeout)
+    return create_async_engine(async_url(url), **pool)
+
+def _pool_options(pool_size: int, max_overflow: int, pool_recycle: int, pool_timeout: int) -> dict:
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": pool_recycle,
+        "pool_timeout": pool_timeout,
+        "pool_pre_ping": True,
+    }
+
+def async_session_factory(async_engine):
+    """Фабрика асинхронных сессий.
+
+    expire_on_commit=False: после commit объекты остаются читаемыми без
+    неявных запросов, которые в асинхронном режиме недопустимы.
+    """
+    return async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
@@ -0,0 +1,63 @@
+import logging
+import os
+import tempfile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Варианты фото: имя -> максимальная сторона в пикселях
+VARIANTS = {
+    "thumb": 400,
+    "medium": 1280,
+}
+WEBP_QUALITY = 80
+
+def variant_filename(filename: str, variant: str) -> str:
+    """Имя файла уменьшенной копии: <имя>_<вариант>.webp"""
+    stem = os.path.splitext(filename)[0]
+    return f"{stem}_{variant}.webp"
+
+def make_variants(upload_dir: str, filename: str) -> dict:
+    """Создает уменьшенные копии фото в формате WebP.
+
+    Возвращает {вариант: имя файла}. Если файл не удалось прочитать как
+    изображение (или в нем слишком много пикселей - возможная
+    "декомпрессионная бомба"), возвращает пустой словарь и клиенты
+    используют оригинал.
+    """
+    result = {variant: variant_filename(filename, variant) for variant in VARIANTS}
+    if all(os.path.exists(os.path.join(upload_dir, name)) for name in result.values()):
+        # Такое же фото уже загружали, копии готовы
+        return result
+
+    source_path = os.path.join(upload_dir, filename)
+    # От большей копии к меньшей: каждая уменьшается из предыдущей, а не из оригинала
+    sizes = sorted(VARIANTS.items(), key=lambda item: item[1], reverse=True)
+    try:
+        with Image.open(source_path) as image:
+            # JPEG декодируется сразу в уменьшенном масштабе (1/2..1/8), не меньше
+            # самой большой копии - полный кадр 12+ Мп в память не попадает
+            image.draft("RGB", (sizes[0][1], sizes[0][1]))
+            # Телефоны пишут поворот в EXIF, при уменьшении он бы потерялся
+            image = ImageOps.exif_transpose(image)
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+            for variant, max_side in sizes:
+                image.thumbnail((max_side, max_side))
+                _save_atomic(image, os.path.join(upload_dir, result[variant]))
+            return result
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.warning("Не удалось создать миниатюры для %s: %s", filename, e)
+        return {}
+
+def _save_atomic(image: Image.Image, path: str) -> None:
+    """Пишет WebP во временный файл рядом и переименовывает его: проверка
+    готовых копий в make_variants не увидит недописанный файл."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            image.save(f, "WEBP", quality=WEBP_QUALITY)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
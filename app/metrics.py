@@ -0,0 +1,128 @@
+"""Метрики приложения в формате Prometheus (GET /metrics).
+
+Значения хранятся в памяти процесса: при нескольких процессах uvicorn
+Prometheus опрашивает каждый процесс отдельно.
+"""
+import time
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy import event
+
+METRICS_MEDIA_TYPE = CONTENT_TYPE_LATEST
+
+# Границы корзин гистограмм, секунд
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Границы корзин размера загрузок, байт
+SIZE_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 ** 2, 2 * 1024 ** 2, 5 * 1024 ** 2, 10 * 1024 ** 2)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Время обработки HTTP-запроса",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP-запросы в обработке")
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Время выполнения SQL-запроса",
+    ["engine", "operation"], buckets=LATENCY_BUCKETS
+)
+DB_POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds", "Ожидание соединения из пула (включая pre-ping)",
+    ["engine"], buckets=LATENCY_BUCKETS
+)
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Соединения, выданные из пула", ["engine"])
+UPLOAD_BYTES = Histogram("upload_size_bytes", "Размер загруженных фото", buckets=SIZE_BUCKETS)
+UPLOAD_DURATION = Histogram(
+    "upload_duration_seconds", "Время приема и сохранения фото", buckets=LATENCY_BUCKETS
+)
+UPLOADS_REJECTED = Counter("uploads_rejected_total", "Загрузки, отклоненные из-за размера")
+ACTIVE_SESSIONS = Gauge("active_sessions", "Активные сессии пользователей")
+
+def render_metrics() -> bytes:
+    """Все метрики в текстовом формате Prometheus"""
+    return generate_latest()
+
+def route_label(scope) -> str:
+    """Шаблон пути маршрута (/places/{id}), а не сам путь: число меток ограничено"""
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+class MetricsMiddleware:
+    """ASGI-middleware: гистограмма времени HTTP-запросов по маршрутам.
+
+    Время считается до отправки последнего байта ответа, поэтому потоковые
+    ответы учитываются целиком.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            REQUEST_DURATION.labels(scope["method"], route_label(scope), str(status)).observe(
+                time.perf_counter() - start
+            )
+
+# Метка operation: первое слово SQL, прочие команды попадают в OTHER
+QUERY_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY", "BEGIN", "COMMIT", "ROLLBACK"}
+
+def query_operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in QUERY_OPERATIONS else "OTHER"
+
+def instrument_engine(engine, name: str):
+    """Подключает метрики к движку: время SQL-запросов и ожидание пула.
+
+    engine - синхронный или асинхронный движок SQLAlchemy.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    pool = sync_engine.pool
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def end_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_DURATION.labels(name, query_operation(statement)).observe(elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def failed_query(context):
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT.labels(name).observe(time.perf_counter() - start)
+
+    pool.connect = timed_connect
+    DB_POOL_CHECKED_OUT.labels(name).set_function(pool.checkedout)
+
+def gauge_from(values: dict, key: str):
+    """Функция для Gauge.set_function: значение из словаря (NaN, пока неизвестно)"""
+    def read() -> float:
+        value = values.get(key)
+        return float("nan") if value is None else value
+    return read
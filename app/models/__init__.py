@@ -0,0 +1 @@
+from app.models.place import Base, Place
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, func
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Computed, Integer, String, Float, Text, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
 from geoalchemy2 import Geometry
+from app.search import SEARCH_VECTOR_SQL
 
 Base = declarative_base()
 
@@ -18,8 +20,11 @@ class Place(Base):
     location = Column(Geometry('POINT', srid=4326))
     
     photo_path = Column(String(500))
+    thumbnail_path = Column(String(500))  # уменьшенные копии фото (WebP)
+    medium_path = Column(String(500))
     user_id = Column(Integer, nullable=False, default=1)
     tags = Column(JSONB, default=list)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))  # вычисляет БД
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
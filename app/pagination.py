@@ -0,0 +1,89 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import func, select, tuple_
+
+# Сколько последних изменений перечитывается при следующей синхронизации.
+# Время изменения - начало транзакции (now()), а не момент фиксации: строки
+# долгой транзакции (например, пачки COPY импорта) становятся видны позже,
+# чем более новые строки, и без перекрытия курсор проскочил бы их
+SYNC_OVERLAP = timedelta(minutes=5)
+
+def encode_cursor(created_at: datetime, place_id: int) -> str:
+    """Кодирует позицию (created_at, id) в непрозрачный токен"""
+    raw = json.dumps([created_at.isoformat(), place_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Декодирует токен курсора, при ошибке бросает ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, place_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(place_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Некорректный курсор") from e
+
+async def keyset_page(db, query, model, cursor: Optional[str], limit: int):
+    """Возвращает страницу (строки, next_cursor) в порядке created_at DESC, id DESC.
+
+    Вместо OFFSET продолжает с позиции из курсора, поэтому глубокие страницы
+    читают из индекса idx_places_created_at_id ровно limit + 1 строк.
+    Пустой курсор означает первую страницу. query - выборка колонок, в строках
+    которой есть created_at и id.
+    """
+    if cursor:
+        created_at, place_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, place_id))
+
+    rows = (await db.execute(
+        query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    )).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+def modified_at(model):
+    """Время последнего изменения места: updated_at, а для неизменявшихся created_at"""
+    return func.coalesce(model.updated_at, model.created_at)
+
+def settle_position(since: datetime, after_id: int, horizon: datetime) -> Tuple[datetime, int]:
+    """Отодвигает позицию синхронизации не дальше horizon.
+
+    С id 0 следующий запрос вернет все места со временем изменения от horizon.
+    """
+    if since > horizon:
+        return horizon, 0
+    return since, after_id
+
+async def changes_page(db, query, model, since: datetime, after_id: int, limit: int,
+                       overlap: timedelta = SYNC_OVERLAP):
+    """Возвращает места, измененные после позиции (since, after_id).
+
+    Результат: (строки, next_since, next_after_id, has_more). Позиция включает
+    id, поэтому места с одинаковым временем (например, из одной транзакции)
+    не теряются и не повторяются между страницами. Отбор идет по индексу
+    idx_places_modified_at_id. В строках query должны быть id, created_at и updated_at.
+
+    На последней странице позиция отодвигается на overlap назад от текущего
+    времени БД: следующая синхронизация перечитает это окно и получит строки
+    транзакций, зафиксированных позже. Повторно пришедшие места клиент
+    заменяет по id. Транзакции длиннее overlap по-прежнему могут быть пропущены.
+    """
+    changed = modified_at(model)
+    rows = (await db.execute(query.filter(
+        tuple_(changed, model.id) > tuple_(since, after_id)
+    ).order_by(changed, model.id).limit(limit + 1))).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        last = rows[-1]
+        since, after_id = last.updated_at or last.created_at, last.id
+    if not has_more:
+        now = await db.scalar(select(func.now()))
+        since, after_id = settle_position(since, after_id, now - overlap)
+    return rows, since, after_id, has_more
@@ -0,0 +1,117 @@
+"""Профилирование SQL (включается настройкой, по умолчанию выключено).
+
+Для каждого запроса к API считает число SQL-команд и суммарное время в БД,
+отдает их в заголовке Server-Timing и пишет в лог. Команды дольше
+порога пишутся в лог вместе с планом EXPLAIN. Когда профилирование
+выключено, обработчики событий и middleware не подключаются вовсе.
+"""
+import contextvars
+import logging
+import time
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = 200  # порог медленной команды, мс
+PROFILE_MAX_QUERIES = 20  # больше команд на запрос - вероятно, N+1
+
+# Статистика текущего HTTP-запроса (None вне ProfilingMiddleware)
+_request_stats = contextvars.ContextVar("request_stats", default=None)
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0  # секунд
+
+def _explain(dbapi_connection, statement: str, parameters) -> str:
+    """План команды; в точке сохранения, чтобы ошибка не прервала транзакцию"""
+    explain_cursor = dbapi_connection.cursor()
+    try:
+        explain_cursor.execute("SAVEPOINT profiling_explain")
+        try:
+            explain_cursor.execute("EXPLAIN " + statement, parameters)
+            plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+        except Exception as e:
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT profiling_explain")
+            plan = f"EXPLAIN не выполнен: {e}"
+        explain_cursor.execute("RELEASE SAVEPOINT profiling_explain")
+        return plan
+    finally:
+        explain_cursor.close()
+
+def profile_engine(engine, slow_query_ms: float = SLOW_QUERY_MS, explain: bool = True):
+    """Подключает к движку подсчет команд и лог медленных команд.
+
+    engine - синхронный или асинхронный движок SQLAlchemy. EXPLAIN
+    выполняется только для SELECT/WITH (без ANALYZE, команда не повторяется).
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    threshold = slow_query_ms / 1000
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def end_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["profile_start"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+        if elapsed < threshold:
+            return
+        plan = None
+        if explain and not executemany and statement.lstrip()[:6].upper() in ("SELECT", "WITH"):
+            plan = _explain(conn.connection, statement, parameters)
+        logger.warning(
+            "Медленный SQL (%.1f мс): %s\nПараметры: %r%s",
+            elapsed * 1000, statement.strip(), parameters, f"\nПлан:\n{plan}" if plan else ""
+        )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def failed_query(context):
+        starts = context.connection.info.get("profile_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+class ProfilingMiddleware:
+    """ASGI-middleware: число SQL-команд и время в БД на каждый HTTP-запрос.
+
+    Добавляет заголовок Server-Timing (db - время в БД, app - время до
+    начала ответа). Команды, выполненные уже во время потоковой отдачи,
+    в заголовок не попадают, но учитываются в логе.
+    """
+
+    def __init__(self, app, max_queries: int = PROFILE_MAX_QUERIES):
+        self.app = app
+        self.max_queries = max_queries
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = (
+                    f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+                    f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", timing.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            log = logger.warning if stats.queries > self.max_queries else logger.info
+            log(
+                "%s %s: %d SQL-команд, %.1f мс в БД, %.1f мс всего",
+                scope["method"], scope["path"], stats.queries,
+                stats.db_time * 1000, (time.perf_counter() - start) * 1000
+            )
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import logging
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from fastapi import WebSocket, WebSocketDisconnect
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from app.spatial import parse_bbox
+
+logger = logging.getLogger(__name__)
+
+# Канал Postgres, в который create_place сообщает id нового места
+PLACES_CHANNEL = "places_created"
+# Уведомление о массовом импорте: "imported:<число мест>"
+IMPORTED_PREFIX = "imported:"
+RECONNECT_DELAY = 5  # секунд до первой попытки переподключения
+MAX_RECONNECT_DELAY = 60  # секунд, предел удвоения задержки
+UNSUPPORTED_DATA = 1003  # код закрытия WebSocket на бинарные и некорректные сообщения
+
+async def notify_place_created(db, place_id: int):
+    """Ставит уведомление о новом месте; Postgres доставит его после COMMIT"""
+    await db.execute(text("SELECT pg_notify(:channel, :payload)"),
+               {"channel": PLACES_CHANNEL, "payload": str(place_id)})
+
+async def notify_places_imported(db, count: int):
+    """Одно уведомление на пачку импортированных мест (после COMMIT).
+
+    Id всей пачки не помещаются в payload NOTIFY (до 8000 байт), поэтому
+    клиенты получают только число мест и догоняют их через /changes.
+    """
+    await db.execute(text("SELECT pg_notify(:channel, :payload)"),
+               {"channel": PLACES_CHANNEL, "payload": f"{IMPORTED_PREFIX}{count}"})
+
+class Subscriber:
+    """Подключенный клиент: очередь сообщений и необязательный фильтр по области"""
+
+    def __init__(self, bbox=None, queue_size: int = 100):
+        self.bbox = bbox
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+    def wants(self, place: dict) -> bool:
+        if self.bbox is None:
+            return True
+        min_lat, max_lat, min_lon, max_lon = self.bbox
+        return min_lat <= place["lat"] <= max_lat and min_lon <= place["lon"] <= max_lon
+
+class PlaceHub:
+    """Рассылка новых мест подключенным по WebSocket клиентам.
+
+    Уведомления приходят через LISTEN/NOTIFY, поэтому каждый процесс uvicorn
+    узнает о местах, созданных в любом другом процессе. Корутина load_place(id)
+    возвращает место в формате ответа API, on_change вызывается на каждое
+    уведомление (например, для сброса кэша ответов).
+    """
+
+    def __init__(self, load_place, on_change=None):
+        self.load_place = load_place
+        self.on_change = on_change
+        self.subscribers = set()
+        self._dsn = None
+        self._conn = None
+        self._loop = None
+        self._reconnect_delay = RECONNECT_DELAY
+        # Ссылки на фоновые задачи, иначе сборщик мусора может удалить их до завершения
+        self._tasks = set()
+
+    def _spawn(self, coro, name: str):
+        """Запускает фоновую задачу и пишет в лог ее ошибку"""
+        task = asyncio.get_running_loop().create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Ошибка в задаче %s", task.get_name(), exc_info=task.exception())
+
+    def publish(self, place: dict):
+        """Отправляет место всем подписчикам, чья область его содержит"""
+        message = {"type": "place_created", "place": place}
+        for subscriber in list(self.subscribers):
+            if not subscriber.wants(place):
+                continue
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Медленный клиент пропустит событие и догонит через /changes
+                logger.warning("Очередь подписчика переполнена, событие пропущено")
+
+    def publish_all(self, message: dict):
+        """Отправляет сообщение всем подписчикам независимо от области"""
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning("Очередь подписчика переполнена, событие пропущено")
+
+    async def handle_notification(self, payload: str):
+        if self.on_change:
+            self.on_change()
+        if payload.startswith(IMPORTED_PREFIX):
+            self.publish_all({"type": "places_imported", "count": int(payload[len(IMPORTED_PREFIX):])})
+            return
+        place = await self.load_place(int(payload))
+        if place:
+            self.publish(place)
+
+    async def start(self, dsn: str):
+        """Подключается к Postgres и начинает слушать канал"""
+        self._dsn = dsn
+        self._loop = asyncio.get_running_loop()
+        await self._connect()
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        if self._conn is not None:
+            self._loop.remove_reader(self._conn.fileno())
+            self._conn.close()
+            self._conn = None
+        self._dsn = None
+
+    async def _connect(self):
+        try:
+            conn = await run_in_threadpool(psycopg2.connect, self._dsn)
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {PLACES_CHANNEL}")
+        except (psycopg2.Error, OSError) as e:
+            logger.warning("Не удалось подписаться на %s: %s", PLACES_CHANNEL, e)
+            self._schedule_reconnect()
+            return
+        self._conn = conn
+        self._reconnect_delay = RECONNECT_DELAY
+        self._loop.add_reader(conn.fileno(), self._on_readable)
+
+    def _schedule_reconnect(self):
+        """Переподключение с экспоненциально растущей задержкой"""
+        self._loop.call_later(self._reconnect_delay, self._reconnect)
+        self._reconnect_delay = min(self._reconnect_delay * 2, MAX_RECONNECT_DELAY)
+
+    def _reconnect(self):
+        if self._dsn is not None:
+            self._spawn(self._connect(), "places-listen-connect")
+
+    def _on_readable(self):
+        try:
+            self._conn.poll()
+        except psycopg2.OperationalError as e:
+            logger.warning("Соединение LISTEN потеряно: %s", e)
+            self._loop.remove_reader(self._conn.fileno())
+            self._conn = None
+            self._schedule_reconnect()
+            return
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            self._spawn(self.handle_notification(notify.payload), f"place-notification-{notify.payload}")
+
+    async def serve(self, websocket: WebSocket, bbox: str = None):
+        """Обслуживает WebSocket-подключение до его закрытия.
+
+        Клиент может в любой момент прислать {"bbox": "min_lon,min_lat,max_lon,max_lat"}
+        (или {"bbox": null}), чтобы сменить область подписки.
+        """
+        await websocket.accept()
+        subscriber = Subscriber(self._parse_bbox(bbox))
+        self.subscribers.add(subscriber)
+
+        async def send_loop():
+            while True:
+                await websocket.send_json(await subscriber.queue.get())
+
+        sender = self._spawn(send_loop(), "websocket-send")
+        try:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                except (KeyError, ValueError):
+                    # Бинарный кадр (KeyError в receive_text) или не JSON
+                    message = None
+                if not isinstance(message, dict):
+                    await websocket.close(code=UNSUPPORTED_DATA)
+                    break
+                if "bbox" in message:
+                    subscriber.bbox = self._parse_bbox(message["bbox"])
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            self.subscribers.discard(subscriber)
+
+    @staticmethod
+    def _parse_bbox(value):
+        if not value:
+            return None
+        try:
+            return parse_bbox(value)
+        except (TypeError, ValueError):
+            return None
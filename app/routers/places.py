@@ -1,45 +1,60 @@
-import os
-import shutil
-import uuid
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Response, Depends, UploadFile, File, Form, HTTPException, BackgroundTasks
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional, Union
 from app import models, schemas
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_async_db
 from app.config import settings
-from geoalchemy2.functions import ST_Point
+from app.images import make_variants
+from app.pagination import keyset_page
+from app.serialization import place_columns, rows_to_dicts, dumps
+from app.spatial import make_point
+from app.uploads import save_upload_file, delete_upload_file, acquire_photo
 
 router = APIRouter(prefix="/places", tags=["places"])
 
-def save_upload_file(upload_file: UploadFile) -> str:
-    """Сохраняет загруженный файл и возвращает путь к нему"""
-    file_ext = os.path.splitext(upload_file.filename)[1]
-    filename = f"{uuid.uuid4()}{file_ext}"
-    
-    os.makedirs(settings.upload_dir, exist_ok=True)
-    file_path = os.path.join(settings.upload_dir, filename)
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
+# Колонки ответа API: списки мест выбираются кортежами, без ORM-объектов
+PLACE_COLUMNS = place_columns(models.Place, models.Place.tags, static_prefix="/static/uploads/")
+
+async def save_place(db: AsyncSession, db_place: models.Place) -> models.Place:
+    """Записывает место в БД"""
+    db.add(db_place)
+    await acquire_photo(db, db_place.photo_path, settings.upload_dir)
+    await db.commit()
+    await db.refresh(db_place)
+    return db_place
+
+async def process_photo(place_id: int, photo_filename: str):
+    """Создает миниатюры фото и сохраняет их пути (фоновая задача)"""
+    variants = await run_in_threadpool(make_variants, settings.upload_dir, photo_filename)
+    if not variants:
+        return
     
-    return filename
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(models.Place).filter(models.Place.id == place_id).values(
+            thumbnail_path=variants["thumb"],
+            medium_path=variants["medium"]
+        ))
+        await db.commit()
 
 @router.post("/", response_model=schemas.PlaceResponse)
 async def create_place(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: str = Form(None),
     lat: float = Form(...),
     lon: float = Form(...),
     tags: str = Form(""),
     photo: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Создание нового места с фото"""
     
     if not photo.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="Файл должен быть изображением")
     
-    photo_filename = save_upload_file(photo)
+    photo_filename = await save_upload_file(photo, settings.upload_dir, settings.max_upload_size)
     tag_list = [tag.strip() for tag in tags.split(",")] if tags else []
     
     db_place = models.Place(
@@ -47,37 +62,47 @@ async def create_place(
         description=description,
         lat=lat,
         lon=lon,
-        location=ST_Point(lon, lat),
+        location=make_point(lon, lat),
         photo_path=photo_filename,
         user_id=1,
         tags=tag_list
     )
     
-    db.add(db_place)
-    db.commit()
-    db.refresh(db_place)
+    try:
+        db_place = await save_place(db, db_place)
+    except Exception:
+        await delete_upload_file(settings.upload_dir, photo_filename, AsyncSessionLocal)
+        raise
     
-    photo_url = f"/static/uploads/{photo_filename}"
+    background_tasks.add_task(process_photo, db_place.id, photo_filename)
     
-    return {
-        **db_place.__dict__,
-        "photo_url": photo_url
-    }
+    # Ответ собирается теми же колонками, что и списки мест, а не из __dict__ ORM-объекта
+    row = (await db.execute(
+        select(*PLACE_COLUMNS).filter(models.Place.id == db_place.id)
+    )).one()
+    return Response(content=dumps(rows_to_dicts([row])[0]), media_type="application/json")
 
-@router.get("/", response_model=List[schemas.PlaceResponse])
-def get_places(
+@router.get("/", response_model=Union[List[schemas.PlaceResponse], schemas.PlacePage])
+async def get_places(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Получение списка мест"""
-    places = db.query(models.Place).offset(skip).limit(limit).all()
-    
-    result = []
-    for place in places:
-        place_dict = place.__dict__.copy()
-        if place.photo_path:
-            place_dict["photo_url"] = f"/static/uploads/{place.photo_path}"
-        result.append(place_dict)
+    """Получение списка мест (skip/limit или курсор)"""
+    next_cursor = None
+    if cursor is None:
+        places = (await db.execute(
+            select(*PLACE_COLUMNS).order_by(models.Place.created_at.desc()).offset(skip).limit(limit)
+        )).all()
+    else:
+        try:
+            places, next_cursor = await keyset_page(db, select(*PLACE_COLUMNS), models.Place, cursor, limit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Некорректный курсор")
     
-    return result
\ No newline at end of file
+    result = rows_to_dicts(places)
+    if cursor is not None:
+        result = {"items": result, "next_cursor": next_cursor}
+    # Готовый JSON без повторной валидации через response_model
+    return Response(content=dumps(result), media_type="application/json")
\ No newline at end of file
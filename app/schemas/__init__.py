@@ -0,0 +1 @@
+from app.schemas.place import PlaceBase, PlaceCreate, PlaceResponse, PlacePage
@@ -15,8 +15,13 @@ class PlaceCreate(PlaceBase):
 class PlaceResponse(PlaceBase):
     id: int
     photo_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
     user_id: int
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PlacePage(BaseModel):
+    items: List[PlaceResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
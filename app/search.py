@@ -0,0 +1,84 @@
+import sys
+from typing import Optional
+from sqlalchemy import func, literal_column, select, case
+
+# Конфигурация полнотекстового поиска: русская морфология (стемминг)
+SEARCH_CONFIG = "russian"
+
+# Подсказок названий в ответе по умолчанию
+SUGGEST_LIMIT = 10
+# Из более коротких строк pg_trgm не извлекает триграмм для поиска по индексу
+TRIGRAM_MIN_LENGTH = 3
+
+# Поисковый вектор места: название важнее описания. Колонка search_vector
+# вычисляется БД (GENERATED ... STORED) и индексируется GIN (app/schema.py)
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+def parse_tag_list(value: Optional[str]) -> list:
+    """Теги из параметра запроса через запятую"""
+    return [tag.strip() for tag in (value or "").split(",") if tag.strip()]
+
+def search_query(query: str):
+    """tsquery из строки пользователя (синтаксис как у поисковиков: "фраза", -слово, or)"""
+    return func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), query)
+
+def search_filter(model, q: Optional[str] = None, tags: Optional[list] = None) -> list:
+    """Условия поиска мест по тексту и тегам.
+
+    Текст сравнивается оператором @@ с колонкой search_vector (GIN-индекс),
+    теги - оператором @> (место содержит все теги, GIN-индекс по tags),
+    поэтому ни одно условие не сканирует таблицу, как ILIKE.
+    """
+    conditions = []
+    if q:
+        conditions.append(model.search_vector.op("@@")(search_query(q)))
+    if tags:
+        conditions.append(model.tags.contains(tags))
+    return conditions
+
+def search_rank(model, q: str):
+    """Релевантность места запросу для сортировки (больше - лучше)"""
+    return func.ts_rank_cd(model.search_vector, search_query(q))
+
+def escape_like(value: str) -> str:
+    """Экранирует спецсимволы LIKE (%, _ и \\)"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def suggest_query(model, prefix: str, limit: int = SUGGEST_LIMIT):
+    """Подсказки названий мест по мере ввода (prefix - от 1 символа без пробелов по краям).
+
+    ILIKE '%...%' обслуживается триграммным GIN-индексом по title (pg_trgm),
+    поэтому находит совпадение в любом слове названия без сканирования
+    таблицы. Сначала идут названия, начинающиеся с введенного текста,
+    затем более похожие (similarity).
+
+    Для 1-2 символов триграмм нет, и такой запрос прочитал бы и отсортировал
+    все места. Поэтому короткий текст ищется только в начале названия:
+    диапазон lower(title) COLLATE "C" >= 'жи' AND < 'жй' по btree-индексу
+    idx_places_title_lower_c. В побайтовом порядке "C" диапазон равен
+    совпадению префикса, а ORDER BY по тому же выражению читает первые
+    limit названий из индекса без сортировки (и в общем плане prepared
+    statement, где LIKE с параметром индекс бы не сузил).
+    """
+    prefix = prefix.strip()
+    if not prefix:
+        raise ValueError("Пустой текст для подсказок")
+    columns = (model.id, model.title, model.lat, model.lon)
+    if len(prefix) < TRIGRAM_MIN_LENGTH:
+        title = func.lower(model.title).collate("C")
+        lowered = prefix.lower()
+        conditions = [title >= lowered]
+        if ord(lowered[-1]) < sys.maxunicode:
+            conditions.append(title < lowered[:-1] + chr(ord(lowered[-1]) + 1))
+        return select(*columns).filter(*conditions).order_by(title).limit(limit)
+    pattern = escape_like(prefix)
+    return select(*columns).filter(
+        model.title.ilike(f"%{pattern}%", escape="\\")
+    ).order_by(
+        case((model.title.ilike(f"{pattern}%", escape="\\"), 0), else_=1),
+        func.similarity(model.title, prefix).desc(),
+        model.title
+    ).limit(limit)
@@ -0,0 +1,53 @@
+import orjson
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500  # строк, читаемых из курсора за раз
+
+def place_columns(model, *extra, static_prefix: str = "/static/"):
+    """Колонки для выборки мест кортежами, без создания ORM-объектов.
+
+    URL фото собираются в SQL (NULL || ... дает NULL), поэтому строка
+    результата уже совпадает с ответом API. extra - дополнительные поля
+    ответа (например, имя автора). Последней идет служебная колонка
+    updated_at: она нужна для Last-Modified и позиции синхронизации,
+    но в ответ не попадает.
+    """
+    return [
+        model.id,
+        model.title,
+        model.description,
+        model.lat,
+        model.lon,
+        (static_prefix + model.photo_path).label("photo_url"),
+        (static_prefix + model.thumbnail_path).label("thumbnail_url"),
+        model.user_id,
+        model.created_at,
+        *extra,
+        model.updated_at,
+    ]
+
+def rows_to_dicts(rows) -> list:
+    """Строки выборки place_columns -> словари ответа (без updated_at)"""
+    if not rows:
+        return []
+    fields = rows[0]._fields[:-1]
+    return [dict(zip(fields, row)) for row in rows]
+
+def dumps(data) -> bytes:
+    """Сериализует ответ в JSON (UTF-8); datetime пишется в ISO 8601"""
+    return orjson.dumps(data)
+
+def wants_ndjson(request, stream: bool = False) -> bool:
+    """Клиент просит потоковый ответ: ?stream=1 или Accept: application/x-ndjson"""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+async def stream_ndjson(session_factory, query, batch_size: int = STREAM_BATCH_SIZE):
+    """Отдает строки выборки place_columns в формате NDJSON по мере чтения.
+
+    Строки читаются серверным курсором пачками по batch_size, поэтому память
+    не зависит от размера результата, а первые байты уходят клиенту сразу.
+    """
+    async with session_factory() as db:
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield b"".join(orjson.dumps(place) + b"\n" for place in rows_to_dicts(rows))
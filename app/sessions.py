@@ -0,0 +1,96 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+# Время жизни сессии по умолчанию
+SESSION_TTL = 7 * 24 * 3600  # секунд
+
+class CurrentUser(NamedTuple):
+    """Вошедший пользователь: только то, что нужно обработчикам запросов.
+
+    Неизменяемая замена ORM-объекта для кэша и подписанных токенов: не
+    содержит хеша пароля и не привязана к сессии БД.
+    """
+    id: int
+    username: str
+
+class MemorySessionStore:
+    """Сессии в памяти процесса: LRU с ограничением размера и временем жизни.
+
+    Подходит для разработки и одного процесса uvicorn. При переполнении
+    вытесняются давно не использованные сессии.
+    """
+
+    def __init__(self, max_sessions: int = 10000, ttl: int = SESSION_TTL):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()  # token -> (user_id, expires_at)
+        self._lock = threading.Lock()
+
+    async def get(self, token: str) -> Optional[int]:
+        """Возвращает user_id сессии или None, если ее нет или она истекла"""
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            user_id, expires_at = entry
+            if time.monotonic() > expires_at:
+                del self._sessions[token]
+                return None
+            self._sessions.move_to_end(token)
+            return user_id
+
+    async def set(self, token: str, user_id: int):
+        with self._lock:
+            self._sessions[token] = (user_id, time.monotonic() + self.ttl)
+            self._sessions.move_to_end(token)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    async def delete(self, token: str):
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    async def count(self) -> Optional[int]:
+        """Количество активных сессий"""
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for _, expires_at in self._sessions.values() if expires_at >= now)
+
+class RedisSessionStore:
+    """Сессии в Redis (или совместимом сервере), общие для всех процессов.
+
+    client - асинхронный клиент с методами get/set/delete, например
+    redis.asyncio.Redis. Истечение сессий выполняет сам сервер (SET ... EX).
+    """
+
+    def __init__(self, client, ttl: int = SESSION_TTL, prefix: str = "session:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, token: str) -> Optional[int]:
+        value = await self.client.get(self.prefix + token)
+        return int(value) if value is not None else None
+
+    async def set(self, token: str, user_id: int):
+        await self.client.set(self.prefix + token, str(user_id), ex=self.ttl)
+
+    async def delete(self, token: str):
+        await self.client.delete(self.prefix + token)
+
+    async def count(self) -> Optional[int]:
+        # Подсчет потребовал бы сканирования всех ключей
+        return None
+
+def create_session_store(redis_url: Optional[str] = None, ttl: int = SESSION_TTL,
+                         max_sessions: int = 10000, prefix: str = "session:"):
+    """Хранилище сессий: Redis, если задан redis_url, иначе память процесса"""
+    if not redis_url:
+        return MemorySessionStore(max_sessions=max_sessions, ttl=ttl)
+    try:
+        import redis.asyncio as redis
+    except ImportError as e:
+        raise RuntimeError("Для хранения сессий в Redis установите пакет redis") from e
+    return RedisSessionStore(redis.from_url(redis_url), ttl=ttl, prefix=prefix)
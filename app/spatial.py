@@ -0,0 +1,84 @@
+from typing import Optional
+from sqlalchemy import func, false, select
+from sqlalchemy.dialects.postgresql import array_agg, aggregate_order_by
+
+# Система координат всех геометрий в таблице places (WGS 84)
+SRID = 4326
+
+def make_point(lon: float, lat: float):
+    """Возвращает SQL-выражение точки с правильным SRID"""
+    return func.ST_SetSRID(func.ST_MakePoint(lon, lat), SRID)
+
+def nearest_places(columns, location, lat: float, lon: float, k: int,
+                   radius_m: Optional[float] = None):
+    """k ближайших к точке мест с расстоянием distance_m (в метрах).
+
+    Сортировка оператором <-> по geography(location) обслуживается
+    GiST-индексом idx_places_location_geog (k-NN), и ST_DWithin по тому же
+    выражению тоже использует этот индекс, поэтому читаются только
+    ближайшие строки. columns - колонки place_columns: distance_m
+    вставляется перед последней служебной колонкой updated_at.
+    """
+    geog = func.geography(location)
+    point = func.geography(make_point(lon, lat))
+    *fields, updated_at = columns
+    query = select(
+        *fields, func.ST_Distance(geog, point).label("distance_m"), updated_at
+    ).order_by(geog.op("<->")(point)).limit(k)
+    if radius_m is not None:
+        query = query.filter(func.ST_DWithin(geog, point, radius_m))
+    return query
+
+def bbox_filter(location, min_lat: float, max_lat: float, min_lon: float, max_lon: float):
+    """Условие попадания точки в прямоугольник.
+
+    Оператор && сравнивает ограничивающие прямоугольники и обслуживается
+    GiST-индексом по location, поэтому запрос не сканирует всю таблицу.
+    Для точек результат совпадает с четырьмя сравнениями lat/lon (границы включены).
+    """
+    if min_lat > max_lat or min_lon > max_lon:
+        # Перевернутая область: как и раньше, ничего не находим
+        return false()
+    envelope = func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, SRID)
+    return location.op("&&")(envelope)
+
+def parse_bbox(value: str):
+    """Разбирает bbox вида "min_lon,min_lat,max_lon,max_lat".
+
+    Возвращает (min_lat, max_lat, min_lon, max_lon) в порядке параметров
+    bbox-эндпоинтов, при ошибке бросает ValueError.
+    """
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox должен содержать 4 числа")
+    min_lon, min_lat, max_lon, max_lat = parts
+    return min_lat, max_lat, min_lon, max_lon
+
+def grid_cell_size(zoom: int, cells_per_tile: int = 4) -> float:
+    """Размер ячейки сетки в градусах: несколько ячеек на тайл 256px"""
+    return 360.0 / (2 ** zoom) / cells_per_tile
+
+async def cluster_places(db, model, min_lat, max_lat, min_lon, max_lon, zoom: int, sample_size: int = 5):
+    """Группирует места в ячейки регулярной сетки средствами БД.
+
+    Возвращает список ячеек с количеством мест, центроидом и несколькими
+    id новейших мест, так что размер ответа зависит от числа ячеек, а не мест.
+    """
+    cell = grid_cell_size(zoom)
+    cell_x = func.floor(model.lon / cell)
+    cell_y = func.floor(model.lat / cell)
+    sample_ids = array_agg(aggregate_order_by(model.id, model.id.desc()))[1:sample_size]
+
+    rows = (await db.execute(select(
+        func.count(model.id),
+        func.avg(model.lat),
+        func.avg(model.lon),
+        sample_ids,
+    ).filter(
+        bbox_filter(model.location, min_lat, max_lat, min_lon, max_lon)
+    ).group_by(cell_x, cell_y))).all()
+
+    return [
+        {"lat": lat, "lon": lon, "count": count, "sample_ids": ids}
+        for count, lat, lon, ids in rows
+    ]
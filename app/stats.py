@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+STATS_REFRESH_INTERVAL = 60  # секунд между обновлениями статистики
+HEALTH_DB_TIMEOUT = 2  # секунд ожидания ответа БД при проверке здоровья
+
+# Оценка числа строк из статистики планировщика (обновляется autovacuum/ANALYZE).
+# reltuples = -1 у таблиц, которые еще ни разу не анализировались
+ESTIMATE_SQL = text("""
+    SELECT relname, reltuples::bigint
+    FROM pg_class
+    WHERE relname = ANY(:tables) AND relkind = 'r'
+""")
+
+async def check_database(session_factory, timeout: float = HEALTH_DB_TIMEOUT) -> bool:
+    """SELECT 1 через пул соединений; False, если БД не ответила вовремя"""
+    async def ping():
+        async with session_factory() as db:
+            await db.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(ping(), timeout)
+        return True
+    except Exception:
+        return False
+
+class StatsCollector:
+    """Статистика для /stats, обновляемая в фоне, а не при каждом запросе.
+
+    tables - {имя показателя: таблица}: число строк берется из оценки
+    pg_class.reltuples, точный COUNT(*) выполняется только для таблиц без
+    статистики. counters - {имя показателя: асинхронная функция} для
+    прочих значений (например, числа активных сессий).
+    """
+
+    def __init__(self, session_factory, tables: dict, counters: Optional[dict] = None,
+                 interval: float = STATS_REFRESH_INTERVAL):
+        self.session_factory = session_factory
+        self.tables = tables
+        self.counters = counters or {}
+        self.interval = interval
+        self.values = dict.fromkeys([*tables, *self.counters])
+        self.updated_at = None
+        self._task = None
+
+    async def refresh(self):
+        async with self.session_factory() as db:
+            rows = (await db.execute(ESTIMATE_SQL, {"tables": list(self.tables.values())})).all()
+            estimates = dict(rows)
+            for name, table in self.tables.items():
+                count = estimates.get(table)
+                if count is None or count < 0:
+                    # Имена таблиц заданы в коде, а не пришли из запроса
+                    count = (await db.execute(text(f"SELECT count(*) FROM {table}"))).scalar()
+                self.values[name] = count
+        for name, counter in self.counters.items():
+            self.values[name] = await counter()
+        self.updated_at = datetime.now(timezone.utc)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Не удалось обновить статистику: %s", e)
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """Последние значения и время их обновления (None до первого обновления)"""
+        return {**self.values, "updated_at": self.updated_at}
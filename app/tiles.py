@@ -0,0 +1,140 @@
+import math
+import os
+import shutil
+import time
+import uuid
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+MAX_ZOOM = 22
+TILE_CACHE_MAX_AGE = 24 * 3600  # секунд хранения тайла на диске
+GENERATION_FILE = ".generation"  # время изменения - момент последнего сброса кэша
+TILE_EXTENT = 4096  # размер тайла в координатах MVT
+TILE_BUFFER = 256  # буфер вокруг тайла в тех же единицах: значки у края не обрезаются
+TILE_MARGIN = TILE_BUFFER / TILE_EXTENT  # буфер в долях тайла
+
+# Тайл строится целиком в PostGIS: точки переводятся в Web Mercator, в тайл
+# попадают и точки из буфера у его краев, отбор идет по GiST-индексу location
+TILE_SQL = text(f"""
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom,
+               ST_TileEnvelope(:z, :x, :y, margin => {TILE_MARGIN}) AS buffered
+    ),
+    mvtgeom AS (
+        SELECT ST_AsMVTGeom(ST_Transform(p.location, 3857), bounds.geom,
+                            {TILE_EXTENT}, {TILE_BUFFER}) AS geom,
+               p.id,
+               p.title,
+               p.user_id,
+               '/static/' || p.photo_path AS photo_url,
+               '/static/' || p.thumbnail_path AS thumbnail_url
+        FROM places p, bounds
+        WHERE p.location && ST_Transform(bounds.buffered, 4326)
+    )
+    SELECT ST_AsMVT(mvtgeom.*, 'places') FROM mvtgeom
+""")
+
+def tile_in_range(z: int, x: int, y: int) -> bool:
+    """Проверяет, что координаты тайла существуют на данном масштабе"""
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+def _tile_position(lon: float, lat: float, z: int):
+    # Координаты точки в тайлах (дробные) на масштабе z
+    n = 2 ** z
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = (lon + 180.0) / 360.0 * n
+    y = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n
+    return x, y
+
+def tile_for_point(lon: float, lat: float, z: int):
+    """Возвращает (x, y) тайла, содержащего точку"""
+    n = 2 ** z
+    x, y = _tile_position(lon, lat, z)
+    return min(max(int(x), 0), n - 1), min(max(int(y), 0), n - 1)
+
+def tiles_for_point(lon: float, lat: float, z: int):
+    """Возвращает тайлы масштаба z, в которые точка попадает вместе с буфером:
+    содержащий ее тайл и соседние, если точка ближе TILE_MARGIN к их краю"""
+    x, y = _tile_position(lon, lat, z)
+    columns = {math.floor(x + dx) for dx in (-TILE_MARGIN, 0, TILE_MARGIN)}
+    rows = {math.floor(y + dy) for dy in (-TILE_MARGIN, 0, TILE_MARGIN)}
+    tiles = {(tx, ty) for tx in columns for ty in rows if tile_in_range(z, tx, ty)}
+    return tiles or {tile_for_point(lon, lat, z)}
+
+def tile_path(cache_dir: str, z: int, x: int, y: int) -> str:
+    """Путь к тайлу в дисковом кэше"""
+    return os.path.join(cache_dir, str(z), str(x), f"{y}.mvt")
+
+def _read_cached(path: str, max_age: float):
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def _write_cached(path: str, data: bytes):
+    # Пишем через временный файл, чтобы параллельный запрос не прочитал половину тайла
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def cache_generation(cache_dir: str):
+    """Отметка последнего сброса кэша (общая для всех процессов) или None"""
+    try:
+        return os.stat(os.path.join(cache_dir, GENERATION_FILE)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _bump_generation(cache_dir: str):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, GENERATION_FILE)
+    with open(path, "a"):
+        pass
+    # Явное время: без него два сброса подряд могут получить одинаковый mtime
+    stamp = max(time.time_ns(), (cache_generation(cache_dir) or 0) + 1)
+    os.utime(path, ns=(stamp, stamp))
+
+def _write_if_current(path: str, data: bytes, cache_dir: str, generation):
+    # Тайл, построенный до сброса кэша, мог не увидеть новое место - не сохраняем его
+    if cache_generation(cache_dir) == generation:
+        _write_cached(path, data)
+
+async def load_tile(session_factory, cache_dir: str, z: int, x: int, y: int,
+                    max_age: float = TILE_CACHE_MAX_AGE) -> bytes:
+    """Возвращает тайл из кэша, при промахе строит его в БД и сохраняет.
+
+    Тайл не сохраняется, если во время построения кэш сбрасывался; оставшиеся
+    после узкого окна гонки устаревшие тайлы живут не дольше max_age.
+    """
+    path = tile_path(cache_dir, z, x, y)
+    data = await run_in_threadpool(_read_cached, path, max_age)
+    if data is not None:
+        return data
+
+    generation = await run_in_threadpool(cache_generation, cache_dir)
+    async with session_factory() as db:
+        data = (await db.execute(TILE_SQL, {"z": z, "x": x, "y": y})).scalar()
+    data = bytes(data) if data is not None else b""
+    await run_in_threadpool(_write_if_current, path, data, cache_dir, generation)
+    return data
+
+def invalidate_point(cache_dir: str, lon: float, lat: float):
+    """Удаляет из кэша тайлы всех масштабов, в которые попадает точка
+    (с учетом буфера у краев соседних тайлов)"""
+    _bump_generation(cache_dir)
+    for z in range(MAX_ZOOM + 1):
+        for x, y in tiles_for_point(lon, lat, z):
+            try:
+                os.remove(tile_path(cache_dir, z, x, y))
+            except FileNotFoundError:
+                pass
+
+def clear_tiles(cache_dir: str):
+    """Удаляет весь кэш тайлов (после массового изменения мест)"""
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    _bump_generation(cache_dir)
@@ -0,0 +1,76 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from typing import Optional
+
+# Время жизни подписанного токена по умолчанию
+TOKEN_TTL = 24 * 3600  # секунд
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def _signature(secret_key: str, body: str) -> str:
+    return _b64encode(hmac.new(secret_key.encode(), body.encode(), hashlib.sha256).digest())
+
+def is_signed_token(token: str) -> bool:
+    """Отличает подписанный токен от идентификатора серверной сессии (uuid)"""
+    return "." in token
+
+def sign_token(secret_key: str, user_id: int, username: str, ttl: int = TOKEN_TTL) -> str:
+    """Создает токен <данные>.<подпись HMAC-SHA256> с id и именем пользователя.
+
+    Проверить его может любой процесс, знающий secret_key, без обращения
+    к БД и хранилищу сессий.
+    """
+    claims = {
+        "uid": user_id,
+        "name": username,
+        "exp": int(time.time()) + ttl,
+        "jti": uuid.uuid4().hex,  # идентификатор для отзыва
+    }
+    body = _b64encode(json.dumps(claims, separators=(",", ":"), ensure_ascii=False).encode())
+    return f"{body}.{_signature(secret_key, body)}"
+
+def verify_token(secret_key: str, token: str) -> Optional[dict]:
+    """Возвращает данные токена или None, если подпись неверна или срок истек"""
+    try:
+        body, signature = token.split(".")
+    except ValueError:
+        return None
+    # Сравниваются байты: compare_digest не принимает строки с не-ASCII символами
+    if not hmac.compare_digest(signature.encode(), _signature(secret_key, body).encode()):
+        return None
+    try:
+        claims = json.loads(_b64decode(body))
+    except ValueError:
+        return None
+    if not isinstance(claims, dict) or claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+class TokenDenylist:
+    """Отозванные (при выходе) токены, хранятся до истечения их срока.
+
+    store - хранилище из app.sessions со временем жизни не меньше срока
+    токена; с Redis список общий для всех процессов.
+
+    Без Redis (MemorySessionStore) отзыв действует только в процессе, где
+    выполнен выход: в других процессах uvicorn токен остается действительным,
+    а при переполнении хранилища (max_sessions) отозванный токен вытесняется
+    и снова принимается. Для нескольких процессов задавайте REDIS_URL.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    async def revoke(self, claims: dict):
+        await self.store.set(claims["jti"], claims["uid"])
+
+    async def is_revoked(self, claims: dict) -> bool:
+        return await self.store.get(claims["jti"]) is not None
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import time
+import uuid
+from typing import Optional
+from fastapi import UploadFile, HTTPException
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from app.metrics import UPLOAD_BYTES, UPLOAD_DURATION, UPLOADS_REJECTED
+
+# Размер куска при потоковой записи на диск
+CHUNK_SIZE = 1024 * 1024
+
+# Запас на остальные поля формы и заголовки multipart сверх размера фото
+FORM_OVERHEAD = 64 * 1024
+
+# Файлы адресуются хешем содержимого и никогда не меняются
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def content_path(digest: str, file_ext: str) -> str:
+    """Относительный путь файла по хешу: ab/cd/abcd...<ext>"""
+    return os.path.join(digest[:2], digest[2:4], f"{digest}{file_ext.lower()}")
+
+def upload_tmp_dir(upload_dir: str) -> str:
+    """Каталог недописанных файлов: рядом с upload_dir, а не внутри раздаваемой папки"""
+    return os.path.normpath(upload_dir) + ".tmp"
+
+def _write_chunk(buffer, hasher, chunk: bytes):
+    hasher.update(chunk)
+    buffer.write(chunk)
+
+def _store(tmp_path: str, final_path: str):
+    """Переносит временный файл на место; одинаковое содержимое хранится один раз"""
+    if os.path.exists(final_path):
+        os.remove(tmp_path)
+        return
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(tmp_path, final_path)
+
+async def save_upload_file(upload_file: UploadFile, upload_dir: str, max_size: int) -> str:
+    """Сохраняет загруженный файл и возвращает его путь относительно upload_dir.
+
+    Файл читается кусками, хешируется (SHA-256) по ходу записи и кладется
+    в шардированный каталог по хешу, поэтому повторная загрузка того же фото
+    не занимает место. Файловые операции выполняются в пуле потоков и не
+    блокируют event loop. Если файл больше max_size байт, возвращается 413.
+    """
+    start = time.perf_counter()
+    file_ext = os.path.splitext(upload_file.filename or "")[1]
+    tmp_dir = upload_tmp_dir(upload_dir)
+    await run_in_threadpool(os.makedirs, tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+
+    size = 0
+    hasher = hashlib.sha256()
+    buffer = await run_in_threadpool(open, tmp_path, "wb")
+    try:
+        while chunk := await upload_file.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                UPLOADS_REJECTED.inc()
+                raise HTTPException(413, f"Файл больше {max_size // (1024 * 1024)} МБ")
+            await run_in_threadpool(_write_chunk, buffer, hasher, chunk)
+    except BaseException:
+        await run_in_threadpool(buffer.close)
+        await run_in_threadpool(os.remove, tmp_path)
+        raise
+    await run_in_threadpool(buffer.close)
+
+    filename = content_path(hasher.hexdigest(), file_ext)
+    await run_in_threadpool(_store, tmp_path, os.path.join(upload_dir, filename))
+    UPLOAD_BYTES.observe(size)
+    UPLOAD_DURATION.observe(time.perf_counter() - start)
+    return filename
+
+def save_bytes(data: bytes, upload_dir: str, file_ext: str) -> str:
+    """Сохраняет содержимое файла по хешу, как save_upload_file (для импорта)"""
+    filename = content_path(hashlib.sha256(data).hexdigest(), file_ext)
+    tmp_dir = upload_tmp_dir(upload_dir)
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    _store(tmp_path, os.path.join(upload_dir, filename))
+    return filename
+
+async def lock_photos(db, paths):
+    """Блокирует файлы фото до конца транзакции (advisory lock по пути).
+
+    Ту же блокировку берет delete_upload_file, поэтому файл не удаляется,
+    пока не зафиксировано место, которое на него ссылается. Пути блокируются
+    в одном порядке, чтобы параллельные транзакции не взаимоблокировались.
+    """
+    for path in sorted(set(paths)):
+        await db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:path))"), {"path": path})
+
+async def acquire_photo(db, filename: str, upload_dir: Optional[str] = None):
+    """Увеличивает счетчик ссылок на файл (в транзакции создания места).
+
+    С upload_dir проверяет, что файл не удалил параллельный запрос, у которого
+    не удалось создать место с тем же фото; тогда возвращается 409.
+    """
+    await lock_photos(db, [filename])
+    if upload_dir is not None and not await run_in_threadpool(
+        os.path.exists, os.path.join(upload_dir, filename)
+    ):
+        raise HTTPException(409, "Фото удалено параллельным запросом, загрузите его еще раз")
+    await db.execute(text("""
+        INSERT INTO photos (path, ref_count) VALUES (:path, 1)
+        ON CONFLICT (path) DO UPDATE SET ref_count = photos.ref_count + 1
+    """), {"path": filename})
+
+async def delete_upload_file(upload_dir: str, filename: str, session_factory, variants=()):
+    """Удаляет сохраненный файл, если на него не ссылается ни одно место.
+
+    Вызывается, когда место не удалось записать в БД: такой же файл мог
+    быть загружен раньше, и тогда его нужно оставить. Проверка и удаление
+    выполняются под блокировкой lock_photos, поэтому место с тем же фото,
+    создаваемое параллельно, либо уже учтено в photos, либо увидит, что
+    файла нет. variants - уменьшенные копии, удаляемые вместе с файлом.
+    """
+    async with session_factory() as db:
+        async with db.begin():
+            await lock_photos(db, [filename])
+            referenced = (await db.execute(
+                text("SELECT ref_count > 0 FROM photos WHERE path = :path"), {"path": filename}
+            )).scalar()
+            if not referenced:
+                for name in (filename, *variants):
+                    try:
+                        await run_in_threadpool(os.remove, os.path.join(upload_dir, name))
+                    except FileNotFoundError:
+                        pass
+
+class UploadLimitMiddleware:
+    """ASGI-middleware: ограничение размера тела POST-запросов на загрузку.
+
+    limits - путь -> максимальный размер тела, байт. Запрос с большим
+    Content-Length отклоняется (413) до чтения тела; без Content-Length
+    прием прерывается, как только прочитано больше лимита. Иначе Starlette
+    сначала сохранил бы всю форму во временный файл, и только потом
+    save_upload_file проверил бы размер.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(scope, receive, send, limit)
+            return
+
+        received = 0
+        started = rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit and not started:
+                    # Отвечаем сразу, а приложению сообщаем об обрыве соединения
+                    rejected = True
+                    await self._reject(scope, receive, send, limit)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def send_with_state(message):
+            nonlocal started
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, send_with_state)
+
+    @staticmethod
+    async def _reject(scope, receive, send, limit: int):
+        UPLOADS_REJECTED.inc()
+        response = JSONResponse(
+            {"detail": f"Файл больше {limit // (1024 * 1024)} МБ"}, status_code=413,
+            headers={"Connection": "close"}
+        )
+        await response(scope, receive, send)
+
+class ImmutableStaticFiles(StaticFiles):
+    """Раздает загруженные фото с заголовком долгого кэширования"""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,106 @@
+"""Сравнение стоимости сериализации списка мест на строку.
+
+До: ORM-объекты PlaceDB -> словарь на строку в цикле -> jsonable_encoder -> json.dumps.
+После: выборка колонок кортежами (place_columns) -> rows_to_dicts -> orjson.
+
+БД - SQLite в памяти с той же структурой таблицы (без PostGIS), поэтому
+измеряется работа Python: создание объектов, identity map и сериализация.
+
+Запуск: python benchmarks/bench_serialization.py [число строк]
+"""
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select, Column, Integer, String, Float, Text, DateTime
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from app.serialization import place_columns, rows_to_dicts, dumps
+
+Base = declarative_base()
+
+class PlaceDB(Base):
+    __tablename__ = "places"
+    
+    id = Column(Integer, primary_key=True)
+    title = Column(String(200), nullable=False)
+    description = Column(Text)
+    lat = Column(Float, nullable=False)
+    lon = Column(Float, nullable=False)
+    photo_path = Column(String(500))
+    thumbnail_path = Column(String(500))
+    medium_path = Column(String(500))
+    user_id = Column(Integer)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+
+def orm_path(db):
+    places = db.scalars(select(PlaceDB)).all()
+    result = []
+    for place in places:
+        result.append({
+            "id": place.id,
+            "title": place.title,
+            "description": place.description,
+            "lat": place.lat,
+            "lon": place.lon,
+            "photo_url": f"/static/{place.photo_path}" if place.photo_path else None,
+            "thumbnail_url": f"/static/{place.thumbnail_path}" if place.thumbnail_path else None,
+            "user_id": place.user_id,
+            "created_at": place.created_at
+        })
+    return json.dumps(jsonable_encoder(result), ensure_ascii=False).encode()
+
+def projection_path(db):
+    rows = db.execute(select(*place_columns(PlaceDB))).all()
+    return dumps(rows_to_dicts(rows))
+
+def measure(session_factory, build, rows: int, repeat: int = 3) -> float:
+    """Лучшее время из repeat запусков, микросекунд на строку"""
+    best = None
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            start = time.perf_counter()
+            build(db)
+            elapsed = time.perf_counter() - start
+        finally:
+            db.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best / rows * 1e6
+
+def main(rows: int = 20000):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    
+    now = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(PlaceDB.__table__.insert(), [
+            {
+                "title": f"Место {i}",
+                "description": "Вид на Волгу и Жигулевские горы",
+                "lat": 53.2 + i * 1e-5,
+                "lon": 50.1 + i * 1e-5,
+                "photo_path": f"ab/cd/{i:064x}.jpg",
+                "thumbnail_path": f"ab/cd/{i:064x}_thumb.webp",
+                "user_id": i % 100,
+                "created_at": now,
+            }
+            for i in range(rows)
+        ])
+    
+    before = measure(SessionLocal, orm_path, rows)
+    after = measure(SessionLocal, projection_path, rows)
+    print(f"Строк: {rows}")
+    print(f"ORM + dict + json:       {before:.2f} мкс/строку")
+    print(f"Колонки + orjson:        {after:.2f} мкс/строку")
+    print(f"Ускорение:               {before / after:.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
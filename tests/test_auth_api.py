@@ -0,0 +1,94 @@
+import sys
+import os
+from datetime import datetime, timezone
+from unittest import mock
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+# Приложение импортируется без БД: создание таблиц и схемы пропускается,
+# запросы к БД заменяет FakeSession
+with mock.patch("sqlalchemy.MetaData.create_all"), mock.patch("app.schema.ensure_schema"):
+    import app.main_auth_simple as auth_app
+
+from app.sessions import CurrentUser
+from app.tokens import sign_token
+
+CREATED_AT = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def first(self):
+        return self.row
+
+    def all(self):
+        return [self.row] if self.row is not None else []
+
+class FakeSession:
+    """Сессия БД с одной строкой пользователя (или без нее)"""
+
+    def __init__(self, row):
+        self.row = row
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        return FakeResult(self.row)
+
+def fake_sessions(monkeypatch, row):
+    monkeypatch.setattr(auth_app, "AsyncSessionLocal", lambda: FakeSession(row))
+
+def test_users_me_session_cookie(monkeypatch):
+    """Тест /api/users/me для пользователя с серверной сессией"""
+    monkeypatch.setattr(auth_app, "SECRET_KEY", None)
+    fake_sessions(monkeypatch, mock.Mock(created_at=CREATED_AT))
+    auth_app.current_users.set("session-token", CurrentUser(3, "Самарец"))
+    client = TestClient(auth_app.app, cookies={"session_token": "session-token"})
+
+    response = client.get("/api/users/me")
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 3, "username": "Самарец", "created_at": CREATED_AT.isoformat()}
+    auth_app.current_users.pop("session-token")
+    print("✅ test_users_me_session_cookie пройден")
+
+def test_users_me_signed_token(monkeypatch):
+    """Тест /api/users/me для пользователя с подписанным токеном"""
+    monkeypatch.setattr(auth_app, "SECRET_KEY", "test-secret")
+    fake_sessions(monkeypatch, mock.Mock(created_at=CREATED_AT))
+    client = TestClient(auth_app.app, cookies={"session_token": sign_token("test-secret", 7, "Волжанин")})
+
+    response = client.get("/api/users/me")
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 7, "username": "Волжанин", "created_at": CREATED_AT.isoformat()}
+    print("✅ test_users_me_signed_token пройден")
+
+def test_users_me_deleted_user(monkeypatch):
+    """Тест: пользователя из токена нет в БД - 401"""
+    monkeypatch.setattr(auth_app, "SECRET_KEY", "test-secret")
+    fake_sessions(monkeypatch, None)
+    client = TestClient(auth_app.app, cookies={"session_token": sign_token("test-secret", 7, "Волжанин")})
+
+    assert client.get("/api/users/me").status_code == 401
+    assert TestClient(auth_app.app).get("/api/users/me").status_code == 401
+    print("✅ test_users_me_deleted_user пройден")
+
+def test_suggest_prefix_validation(monkeypatch):
+    """Тест подсказок: один символ принимается, одни пробелы - 422"""
+    fake_sessions(monkeypatch, None)
+    client = TestClient(auth_app.app)
+
+    assert client.get("/api/places/suggest", params={"prefix": "ж"}).json() == []
+    assert client.get("/api/places/suggest", params={"prefix": " ж "}).status_code == 200
+    assert client.get("/api/places/suggest", params={"prefix": "   "}).status_code == 422
+    assert client.get("/api/places/suggest", params={"prefix": ""}).status_code == 422
+    print("✅ test_suggest_prefix_validation пройден")
@@ -0,0 +1,192 @@
+import asyncio
+import io
+import json
+import sys
+import os
+import zipfile
+from PIL import Image
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncpg
+import app.bulk_import as bulk_import
+from app.bulk_import import ImportReport, read_records, attach_photos, write_batch
+
+CSV_DATA = """title,description,lat,lon,tags,photo
+Самарская набережная,Вид на Волгу,53.2,50.1,"набережная, Волга",
+,Без названия,53.2,50.1,,
+Жигулевские горы,,53.4,abc,,
+Бункер Сталина,,53.19,50.1,история,bunker.jpg
+""".encode()
+
+def test_read_csv():
+    """Тест разбора CSV с ошибками в отдельных строках"""
+    rows = list(read_records(CSV_DATA, "places.csv"))
+
+    assert [row for row, _, _ in rows] == [2, 3, 4, 5]
+    first = rows[0][1]
+    assert first["title"] == "Самарская набережная"
+    assert first["tags"] == ["набережная", "Волга"]
+    assert first["photo"] is None
+    assert rows[1][2] == "Не заполнено название"
+    assert rows[2][2] == "Координаты должны быть числами"
+    assert rows[3][1]["photo"] == "bunker.jpg"
+    print("✅ test_read_csv пройден")
+
+def test_read_geojson():
+    """Тест разбора GeoJSON FeatureCollection"""
+    collection = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [50.1, 53.2]},
+             "properties": {"title": "Площадь Куйбышева", "tags": ["площадь"]}},
+            {"type": "Feature", "geometry": {"type": "LineString", "coordinates": []},
+             "properties": {"title": "Линия"}},
+        ],
+    }
+    rows = list(read_records(json.dumps(collection).encode(), "places.geojson"))
+
+    record = rows[0][1]
+    assert (record["lat"], record["lon"], record["tags"]) == (53.2, 50.1, ["площадь"])
+    assert rows[1][2] == "Геометрия должна быть точкой (Point)"
+    print("✅ test_read_geojson пройден")
+
+def test_read_geojson_wrong_types():
+    """Тест: поля не того типа отклоняются построчно, а не всем файлом"""
+    point = {"type": "Point", "coordinates": [50.1, 53.2]}
+    collection = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": point,
+             "properties": {"title": "Ладья", "description": {"text": "объект"}}},
+            {"type": "Feature", "geometry": point, "properties": {"title": 5}},
+            {"type": "Feature", "geometry": point, "properties": {"title": "Теги", "tags": {"a": 1}}},
+            {"type": "Feature", "geometry": point, "properties": {"title": "Ракета", "description": "Музей"}},
+        ],
+    }
+    rows = list(read_records(json.dumps(collection).encode(), "places.geojson"))
+
+    assert [error for _, _, error in rows] == [
+        "Описание должно быть строкой",
+        "Название должно быть строкой",
+        "Теги должны быть строкой или списком строк",
+        None,
+    ]
+    assert rows[3][1]["description"] == "Музей"
+    print("✅ test_read_geojson_wrong_types пройден")
+
+def test_read_geojson_malformed_features():
+    """Тест: не-объекты в features отклоняются построчно, список Feature тоже читается"""
+    point = {"type": "Point", "coordinates": [50.1, 53.2]}
+    feature = {"type": "Feature", "geometry": point, "properties": {"title": "Ладья"}}
+    collection = {
+        "type": "FeatureCollection",
+        "features": [
+            "строка", 5, None, feature,
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": 5}, "properties": {"title": "Х"}},
+            {"type": "Feature", "geometry": "точка", "properties": {"title": "Х"}},
+            {"type": "Feature", "geometry": point, "properties": ["title"]},
+        ],
+    }
+    rows = list(read_records(json.dumps(collection).encode(), "places.geojson"))
+
+    assert [error for _, _, error in rows] == [
+        "Объект должен быть GeoJSON Feature",
+        "Объект должен быть GeoJSON Feature",
+        "Объект должен быть GeoJSON Feature",
+        None,
+        "Геометрия должна быть точкой (Point)",
+        "Геометрия должна быть точкой (Point)",
+        "properties должен быть объектом",
+    ]
+
+    rows = list(read_records(json.dumps([feature, 7]).encode(), "places.json"))
+    assert rows[0][1]["title"] == "Ладья"
+    assert rows[1][2] == "Объект должен быть GeoJSON Feature"
+    print("✅ test_read_geojson_malformed_features пройден")
+
+def test_attach_photos(tmp_path):
+    """Тест сохранения фото из архива и ошибки для отсутствующего файла"""
+    image = io.BytesIO()
+    Image.new("RGB", (800, 600), "blue").save(image, "JPEG")
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("bunker.jpg", image.getvalue())
+    archive.seek(0)
+
+    records = [
+        (2, {"title": "Бункер", "photo": "bunker.jpg"}),
+        (3, {"title": "Бункер еще раз", "photo": "bunker.jpg"}),
+        (4, {"title": "Без фото в архиве", "photo": "missing.jpg"}),
+    ]
+    report = ImportReport()
+    result = attach_photos(records, archive, str(tmp_path), report)
+
+    assert [row for row, _ in result] == [2, 3]
+    photo_path = result[0][1]["photo_path"]
+    assert photo_path == result[1][1]["photo_path"]
+    assert (tmp_path / photo_path).exists()
+    assert result[0][1]["thumbnail_path"].endswith("_thumb.webp")
+    assert report.errors == [{"row": 4, "error": "Фото missing.jpg нет в архиве"}]
+    print("✅ test_attach_photos пройден")
+
+def test_attach_photos_too_large(tmp_path):
+    """Тест: слишком большое после распаковки фото не читается из архива"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("bomb.jpg", b"\0" * (2 * 1024 * 1024))
+    archive.seek(0)
+
+    report = ImportReport()
+    result = attach_photos([(2, {"title": "Бомба", "photo": "bomb.jpg"})], archive, str(tmp_path), report,
+                           max_photo_size=1024 * 1024)
+
+    assert result == []
+    assert report.errors == [{"row": 2, "error": "Фото bomb.jpg больше 1 МБ"}]
+    assert list(tmp_path.iterdir()) == []
+    print("✅ test_attach_photos_too_large пройден")
+
+class FakeConnection:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeEngine:
+    """Движок, запоминающий записанные (зафиксированные) пачки"""
+
+    def __init__(self):
+        self.committed = []
+
+    def begin(self):
+        return FakeConnection()
+
+def test_write_batch_isolates_bad_rows(monkeypatch):
+    """Тест: ошибка COPY в пачке не теряет хорошие строки, плохие попадают в отчет"""
+    engine = FakeEngine()
+    notifications = []
+
+    async def insert_batch(conn, records, user_id):
+        if any(record["title"].startswith("плохое") for record in records):
+            raise asyncpg.PostgresError("нарушено ограничение")
+        engine.committed.append([record["title"] for record in records])
+
+    async def notify_places_imported(conn, count):
+        notifications.append(count)
+
+    monkeypatch.setattr(bulk_import, "insert_batch", insert_batch)
+    monkeypatch.setattr(bulk_import, "notify_places_imported", notify_places_imported)
+
+    titles = ["а", "б", "плохое 1", "в", "г", "плохое 2", "д", "е"]
+    batch = [(row, {"title": title}) for row, title in enumerate(titles, start=2)]
+    report = ImportReport()
+    failed = asyncio.run(write_batch(engine, batch, 1, report))
+
+    assert [row for row, _ in failed] == [4, 7]
+    assert [error["row"] for error in report.errors] == [4, 7]
+    assert report.imported == 6
+    assert sorted(title for titles in engine.committed for title in titles) == ["а", "б", "в", "г", "д", "е"]
+    assert sum(notifications) == 6 and len(notifications) == len(engine.committed)
+    print("✅ test_write_batch_isolates_bad_rows пройден")
@@ -0,0 +1,83 @@
+import asyncio
+import sys
+import os
+from datetime import datetime, timezone
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Request
+from app.cache import ResponseCache, TTLCache
+
+def make_request(query: bytes = b"", headers=None) -> Request:
+    """Создает запрос GET /api/places/ с заданными заголовками"""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/places/",
+        "query_string": query,
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    })
+
+def test_cache_and_etag():
+    """Тест кэширования ответа и ответа 304 по ETag"""
+    cache = ResponseCache()
+    calls = []
+    modified = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+    async def build():
+        calls.append(1)
+        return [{"id": 1, "title": "Жигулевские горы"}], modified
+
+    first = asyncio.run(cache.respond(make_request(b"limit=10&skip=0"), build))
+    assert first.status_code == 200
+    assert "Жигулевские горы" in first.body.decode()
+    assert first.headers["last-modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+
+    # Порядок параметров не важен, БД не запрашивается
+    second = asyncio.run(cache.respond(make_request(b"skip=0&limit=10"), build))
+    assert second.body == first.body
+    assert len(calls) == 1
+
+    etag = first.headers["etag"]
+    not_modified = asyncio.run(cache.respond(make_request(b"limit=10&skip=0", {"If-None-Match": etag}), build))
+    assert not_modified.status_code == 304
+    assert len(calls) == 1
+
+    since = {"If-Modified-Since": "Wed, 01 May 2024 12:00:00 GMT"}
+    assert asyncio.run(cache.respond(make_request(b"limit=10&skip=0", since), build)).status_code == 304
+    print("✅ test_cache_and_etag пройден")
+
+def test_cache_invalidate():
+    """Тест сброса кэша при добавлении места"""
+    cache = ResponseCache()
+    calls = []
+
+    async def build():
+        calls.append(1)
+        return [], None
+
+    asyncio.run(cache.respond(make_request(), build))
+    cache.invalidate()
+    asyncio.run(cache.respond(make_request(), build))
+
+    assert len(calls) == 2
+    print("✅ test_cache_invalidate пройден")
+
+def test_ttl_cache():
+    """Тест кэша пользователей: вытеснение, сброс и истечение"""
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.pop("a")
+    assert cache.get("a") is None
+
+    expired = TTLCache(ttl=-1)
+    expired.set("x", 1)
+    assert expired.get("x") is None
+    print("✅ test_ttl_cache пройден")
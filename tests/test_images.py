@@ -0,0 +1,49 @@
+import sys
+import os
+from PIL import Image
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.images import make_variants, VARIANTS
+
+def test_make_variants(tmp_path):
+    """Тест создания уменьшенных копий фото"""
+    Image.new("RGB", (3000, 2000), "green").save(tmp_path / "photo.jpg")
+
+    variants = make_variants(str(tmp_path), "photo.jpg")
+
+    assert variants == {"thumb": "photo_thumb.webp", "medium": "photo_medium.webp"}
+    for variant, filename in variants.items():
+        with Image.open(tmp_path / filename) as image:
+            assert image.format == "WEBP"
+            assert max(image.size) == VARIANTS[variant]
+    print("✅ test_make_variants пройден")
+
+def test_make_variants_not_an_image(tmp_path):
+    """Тест: испорченный файл не ломает загрузку"""
+    (tmp_path / "fake.jpg").write_bytes(b"fake_image_data")
+
+    assert make_variants(str(tmp_path), "fake.jpg") == {}
+    print("✅ test_make_variants_not_an_image пройден")
+
+def test_make_variants_decompression_bomb(tmp_path, monkeypatch):
+    """Тест: слишком большое по пикселям изображение пропускается без ошибки"""
+    Image.new("RGB", (300, 200), "green").save(tmp_path / "bomb.png")
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 10000)
+
+    assert make_variants(str(tmp_path), "bomb.png") == {}
+    assert not (tmp_path / "bomb_thumb.webp").exists()
+    print("✅ test_make_variants_decompression_bomb пройден")
+
+def test_make_variants_jpeg_draft(tmp_path):
+    """Тест: большой JPEG уменьшается при декодировании, копии без временных файлов"""
+    Image.new("RGB", (6000, 4000), "green").save(tmp_path / "big.jpg")
+
+    variants = make_variants(str(tmp_path), "big.jpg")
+
+    for variant, filename in variants.items():
+        with Image.open(tmp_path / filename) as image:
+            assert max(image.size) == VARIANTS[variant]
+    assert sorted(os.listdir(tmp_path)) == ["big.jpg", "big_medium.webp", "big_thumb.webp"]
+    print("✅ test_make_variants_jpeg_draft пройден")
@@ -0,0 +1,65 @@
+import asyncio
+import sys
+import os
+import httpx
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.metrics import MetricsMiddleware, instrument_engine, query_operation, render_metrics
+
+def sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_request_metrics():
+    """Тест гистограммы времени запросов по шаблону маршрута"""
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/test-places/{place_id}")
+    async def get_place(place_id: int):
+        return {"id": place_id}
+
+    labels = {"method": "GET", "route": "/test-places/{place_id}", "status": "200"}
+    before = sample("http_request_duration_seconds_count", labels)
+
+    async def requests():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [
+                (await client.get(path)).status_code
+                for path in ["/test-places/1", "/test-places/2", "/missing"]
+            ]
+
+    assert asyncio.run(requests()) == [200, 200, 404]
+
+    assert sample("http_request_duration_seconds_count", labels) == before + 2
+    assert sample("http_request_duration_seconds_count", {"method": "GET", "route": "unmatched", "status": "404"}) >= 1
+    print("✅ test_request_metrics пройден")
+
+def test_engine_metrics():
+    """Тест метрик SQL-запросов и пула соединений"""
+    engine = create_engine("sqlite://", poolclass=QueuePool)
+    instrument_engine(engine, "test")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("select 2"))
+        assert sample("db_pool_checked_out", {"engine": "test"}) == 1
+
+    assert sample("db_query_duration_seconds_count", {"engine": "test", "operation": "SELECT"}) == 2
+    assert sample("db_pool_checkout_seconds_count", {"engine": "test"}) == 1
+    assert sample("db_pool_checked_out", {"engine": "test"}) == 0
+    assert b"db_query_duration_seconds_bucket" in render_metrics()
+    print("✅ test_engine_metrics пройден")
+
+def test_query_operation():
+    """Тест метки типа SQL-запроса"""
+    assert query_operation("\n    SELECT id FROM places") == "SELECT"
+    assert query_operation("CREATE INDEX idx ON places (id)") == "OTHER"
+    assert query_operation("") == "OTHER"
+    print("✅ test_query_operation пройден")
@@ -0,0 +1,34 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.pagination import encode_cursor, decode_cursor, settle_position
+
+def test_cursor_roundtrip():
+    """Тест кодирования и декодирования курсора"""
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+    print("✅ test_cursor_roundtrip пройден")
+
+def test_cursor_invalid():
+    """Тест отказа на испорченном курсоре"""
+    for cursor in ["not-a-cursor", "e30", "WzFd"]:
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+    print("✅ test_cursor_invalid пройден")
+
+def test_settle_position():
+    """Тест: позиция синхронизации не уходит дальше окна перекрытия"""
+    horizon = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    earlier = horizon - timedelta(minutes=1)
+
+    assert settle_position(earlier, 7, horizon) == (earlier, 7)
+    assert settle_position(horizon + timedelta(seconds=1), 7, horizon) == (horizon, 0)
+    print("✅ test_settle_position пройден")
@@ -0,0 +1,44 @@
+import asyncio
+import logging
+import sys
+import os
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.profiling import ProfilingMiddleware, profile_engine
+
+def test_profiling(caplog):
+    """Тест подсчета SQL-команд на запрос, Server-Timing и лога медленных команд"""
+    engine = create_engine("sqlite://")
+    profile_engine(engine, slow_query_ms=0, explain=False)
+
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, max_queries=2)
+
+    @app.get("/test-places")
+    def get_places():
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        return []
+
+    async def request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/test-places")
+
+    with caplog.at_level(logging.INFO, logger="app.profiling"):
+        response = asyncio.run(request())
+
+    assert response.status_code == 200
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+    messages = [record.getMessage() for record in caplog.records]
+    assert sum("Медленный SQL" in message for message in messages) == 3
+    # Больше max_queries команд - предупреждение о возможном N+1
+    summary = [record for record in caplog.records if "SQL-команд" in record.getMessage()]
+    assert summary[0].levelno == logging.WARNING
+    print("✅ test_profiling пройден")
@@ -0,0 +1,130 @@
+import asyncio
+import sys
+import os
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.realtime import PlaceHub, Subscriber
+
+SAMARA = {"id": 1, "title": "Самарская набережная", "lat": 53.2, "lon": 50.1}
+TOLYATTI = {"id": 2, "title": "Парк Победы", "lat": 53.5, "lon": 49.4}
+
+def test_publish_filters_by_bbox():
+    """Тест рассылки с фильтром по области подписки"""
+    async def scenario():
+        hub = PlaceHub(load_place=lambda place_id: None)
+        everywhere = Subscriber()
+        samara = Subscriber(bbox=(53.1, 53.3, 50.0, 50.3))
+        hub.subscribers.update({everywhere, samara})
+
+        hub.publish(SAMARA)
+        hub.publish(TOLYATTI)
+
+        assert everywhere.queue.qsize() == 2
+        assert samara.queue.qsize() == 1
+        message = await samara.queue.get()
+        assert message == {"type": "place_created", "place": SAMARA}
+
+    asyncio.run(scenario())
+    print("✅ test_publish_filters_by_bbox пройден")
+
+def test_handle_notification():
+    """Тест обработки уведомления NOTIFY из другого процесса"""
+    changes = []
+
+    async def load_place(place_id):
+        return {1: SAMARA}.get(place_id)
+
+    async def scenario():
+        hub = PlaceHub(load_place=load_place, on_change=lambda: changes.append(1))
+        subscriber = Subscriber()
+        hub.subscribers.add(subscriber)
+
+        await hub.handle_notification("1")
+        await hub.handle_notification("42")
+
+        assert subscriber.queue.qsize() == 1
+
+    asyncio.run(scenario())
+    assert len(changes) == 2
+    print("✅ test_handle_notification пройден")
+
+def test_failed_task_is_logged(caplog):
+    """Тест: ошибка фоновой задачи попадает в лог, задача не остается в памяти"""
+    async def load_place(place_id):
+        raise RuntimeError("БД недоступна")
+
+    async def scenario():
+        hub = PlaceHub(load_place=load_place)
+        hub._spawn(hub.handle_notification("1"), "place-notification-1")
+        assert len(hub._tasks) == 1
+        await asyncio.sleep(0.01)
+        assert hub._tasks == set()
+
+    asyncio.run(scenario())
+    assert "place-notification-1" in caplog.text
+    assert "БД недоступна" in caplog.text
+    print("✅ test_failed_task_is_logged пройден")
+
+def test_reconnect_backoff():
+    """Тест: задержка переподключения удваивается до предела"""
+    class FakeLoop:
+        def __init__(self):
+            self.delays = []
+
+        def call_later(self, delay, callback):
+            self.delays.append(delay)
+
+    hub = PlaceHub(load_place=lambda place_id: None)
+    hub._loop = FakeLoop()
+    for _ in range(6):
+        hub._schedule_reconnect()
+
+    assert hub._loop.delays == [5, 10, 20, 40, 60, 60]
+    print("✅ test_reconnect_backoff пройден")
+
+def test_handle_imported_notification():
+    """Тест: уведомление об импорте сбрасывает кэш и доходит до всех подписчиков"""
+    changes = []
+
+    async def scenario():
+        hub = PlaceHub(load_place=lambda place_id: None, on_change=lambda: changes.append(1))
+        everywhere = Subscriber()
+        samara = Subscriber(bbox=(53.1, 53.3, 50.0, 50.3))
+        hub.subscribers.update({everywhere, samara})
+
+        await hub.handle_notification("imported:5000")
+
+        for subscriber in (everywhere, samara):
+            assert await subscriber.queue.get() == {"type": "places_imported", "count": 5000}
+
+    asyncio.run(scenario())
+    assert changes == [1]
+    print("✅ test_handle_imported_notification пройден")
+
+def test_serve_rejects_bad_frames():
+    """Тест: бинарный кадр или не JSON закрывают соединение с кодом 1003"""
+    from fastapi import FastAPI, WebSocket
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+
+    hub = PlaceHub(load_place=lambda place_id: None)
+    app = FastAPI()
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await hub.serve(websocket)
+
+    client = TestClient(app)
+    for send in (lambda ws: ws.send_bytes(b"\x00"), lambda ws: ws.send_text("{bbox"), lambda ws: ws.send_text("[]")):
+        with client.websocket_connect("/ws") as websocket:
+            websocket.send_json({"bbox": "50.0,53.1,50.3,53.3"})
+            send(websocket)
+            try:
+                websocket.receive_text()
+                assert False, "соединение должно закрыться"
+            except WebSocketDisconnect as e:
+                assert e.code == 1003
+    assert not hub.subscribers
+    print("✅ test_serve_rejects_bad_frames пройден")
@@ -0,0 +1,56 @@
+import sys
+import os
+from contextlib import contextmanager
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schema import PLACES_DDL, SCHEMA_VERSION, ensure_schema
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+class FakeEngine:
+    """Движок, отвечающий на проверки версии схемы и запоминающий команды"""
+
+    def __init__(self, version):
+        self.version = version
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "to_regclass" in sql:
+            return FakeResult("schema_version" if self.version else None)
+        if sql.startswith("SELECT version"):
+            return FakeResult(self.version)
+        return FakeResult(None)
+
+    @contextmanager
+    def connect(self):
+        yield self
+
+    begin = connect
+
+def test_ensure_schema_current():
+    """Тест: актуальная схема не применяется повторно"""
+    engine = FakeEngine(SCHEMA_VERSION)
+
+    assert ensure_schema(engine) is False
+    assert not any("ALTER TABLE" in sql for sql in engine.statements)
+    print("✅ test_ensure_schema_current пройден")
+
+def test_ensure_schema_applies_under_lock():
+    """Тест: новая схема применяется под advisory lock и записывает версию"""
+    engine = FakeEngine(None)
+
+    assert ensure_schema(engine) is True
+    lock = next(i for i, sql in enumerate(engine.statements) if "pg_advisory_xact_lock" in sql)
+    first_ddl = engine.statements.index(PLACES_DDL[0])
+    assert lock < first_ddl
+    assert "INSERT INTO schema_version" in engine.statements[-1]
+    print("✅ test_ensure_schema_applies_under_lock пройден")
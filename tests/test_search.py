@@ -0,0 +1,60 @@
+import pytest
+import sys
+import os
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.place import Place
+from app.search import escape_like, parse_tag_list, search_filter, search_rank, suggest_query
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+def test_parse_tag_list():
+    """Тест разбора тегов из параметра запроса"""
+    assert parse_tag_list("парк, набережная,,") == ["парк", "набережная"]
+    assert parse_tag_list(None) == []
+    print("✅ test_parse_tag_list пройден")
+
+def test_search_filter():
+    """Тест условий поиска: индексируемые операторы вместо ILIKE"""
+    query = select(Place.id).filter(*search_filter(Place, "волга", ["парк"]))
+    sql = compile_sql(query.order_by(search_rank(Place, "волга").desc()))
+
+    assert "places.search_vector @@ websearch_to_tsquery('russian'" in sql
+    assert "places.tags @>" in sql
+    assert "ILIKE" not in sql.upper()
+    assert search_filter(Place) == []
+    print("✅ test_search_filter пройден")
+
+def test_suggest_query():
+    """Тест подсказок: ILIKE по триграммному индексу с экранированием"""
+    assert escape_like("100%_\\") == "100\\%\\_\\\\"
+
+    query = suggest_query(Place, "жигул", limit=5)
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert "places.title ILIKE" in sql
+    assert "similarity(places.title" in sql
+    assert "%жигул%" in compiled.params.values()
+    print("✅ test_suggest_query пройден")
+
+def test_suggest_query_short_prefix():
+    """Тест: 1-2 символа ищутся диапазоном в начале названия по btree-индексу"""
+    compiled = suggest_query(Place, "Жи", limit=5).compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert '(lower(places.title) COLLATE "C") >=' in sql
+    assert '(lower(places.title) COLLATE "C") <' in sql
+    assert 'ORDER BY lower(places.title) COLLATE "C"' in sql
+    assert "ILIKE" not in sql
+    assert "similarity" not in sql
+    assert {"жи", "жй"} <= set(compiled.params.values())
+    assert "ж" in suggest_query(Place, " Ж ").compile(dialect=postgresql.dialect()).params.values()
+    with pytest.raises(ValueError):
+        suggest_query(Place, "   ")
+    print("✅ test_suggest_query_short_prefix пройден")
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import sys
+import os
+from collections import namedtuple
+from datetime import datetime, timezone
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.serialization import rows_to_dicts, dumps, stream_ndjson
+
+Row = namedtuple("Row", ["id", "title", "photo_url", "created_at", "updated_at"])
+
+def test_rows_to_dicts():
+    """Тест преобразования строк выборки без служебной колонки updated_at"""
+    created = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    rows = [Row(1, "Ширяевский карьер", None, created, created)]
+
+    result = rows_to_dicts(rows)
+    assert result == [{"id": 1, "title": "Ширяевский карьер", "photo_url": None, "created_at": created}]
+    assert rows_to_dicts([]) == []
+    print("✅ test_rows_to_dicts пройден")
+
+def test_dumps():
+    """Тест сериализации: UTF-8 без экранирования и даты в ISO 8601"""
+    created = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    body = dumps([{"title": "Струкачевский парк", "created_at": created}])
+
+    assert "Струкачевский".encode() in body
+    assert json.loads(body)[0]["created_at"] == created.isoformat()
+    print("✅ test_dumps пройден")
+
+class LocalResult:
+    """Результат серверного курсора: строки пачками"""
+
+    def __init__(self, rows, batch_size):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    async def partitions(self):
+        for i in range(0, len(self.rows), self.batch_size):
+            yield self.rows[i:i + self.batch_size]
+
+class LocalSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream(self, query):
+        return LocalResult(self.rows, query.batch_size)
+
+class LocalQuery:
+    def execution_options(self, yield_per):
+        self.batch_size = yield_per
+        return self
+
+def test_stream_ndjson():
+    """Тест потоковой выдачи NDJSON пачками"""
+    created = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    rows = [Row(i, f"Место {i}", None, created, None) for i in range(5)]
+
+    async def collect():
+        return [chunk async for chunk in stream_ndjson(lambda: LocalSession(rows), LocalQuery(), batch_size=2)]
+
+    chunks = asyncio.run(collect())
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [0, 1, 2, 3, 4]
+    assert "updated_at" not in json.loads(lines[0])
+    print("✅ test_stream_ndjson пройден")
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+import sys
+import os
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.sessions import CurrentUser, MemorySessionStore, RedisSessionStore
+
+class LocalRedis:
+    """Заменитель Redis для тестов: get/set/delete без истечения по времени"""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return value.encode() if value is not None else None
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expires[key] = ex
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+def test_memory_store_lru_and_ttl():
+    """Тест вытеснения и истечения сессий в памяти"""
+    async def scenario():
+        store = MemorySessionStore(max_sessions=2)
+        await store.set("a", 1)
+        await store.set("b", 2)
+        assert await store.get("a") == 1  # "a" становится недавно использованной
+        await store.set("c", 3)
+        assert await store.get("b") is None
+        assert await store.get("a") == 1
+        assert await store.count() == 2
+
+        await store.delete("a")
+        assert await store.get("a") is None
+
+        expired = MemorySessionStore(ttl=-1)
+        await expired.set("x", 1)
+        assert await expired.get("x") is None
+
+    asyncio.run(scenario())
+    print("✅ test_memory_store_lru_and_ttl пройден")
+
+def test_redis_store():
+    """Тест хранилища сессий поверх Redis-клиента"""
+    async def scenario():
+        client = LocalRedis()
+        store = RedisSessionStore(client, ttl=60)
+        await store.set("token", 7)
+        assert client.expires["session:token"] == 60
+        assert await store.get("token") == 7
+        await store.delete("token")
+        assert await store.get("token") is None
+
+    asyncio.run(scenario())
+    print("✅ test_redis_store пройден")
+
+def test_current_user_is_immutable():
+    """Тест: в кэше пользователей хранится неизменяемая проекция без пароля"""
+    user = CurrentUser(7, "Волжанин")
+
+    assert (user.id, user.username) == (7, "Волжанин")
+    assert not hasattr(user, "password_hash")
+    with pytest.raises(AttributeError):
+        user.username = "другой"
+    print("✅ test_current_user_is_immutable пройден")
@@ -0,0 +1,58 @@
+import pytest
+import sys
+import os
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import declarative_base
+from geoalchemy2 import Geometry
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.serialization import place_columns
+from app.spatial import nearest_places, parse_bbox
+
+Base = declarative_base()
+
+class Place(Base):
+    __tablename__ = "places"
+    id = Column(Integer, primary_key=True)
+    title = Column(String(200))
+    description = Column(Text)
+    lat = Column(Float)
+    lon = Column(Float)
+    photo_path = Column(String(500))
+    thumbnail_path = Column(String(500))
+    user_id = Column(Integer)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    location = Column(Geometry("POINT", srid=4326))
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+def test_nearest_places():
+    """Тест запроса k ближайших мест"""
+    query = nearest_places(place_columns(Place), Place.location, 53.2, 50.1, k=5, radius_m=1000)
+    sql = compile_sql(query)
+
+    assert "ORDER BY geography(places.location) <-> geography(" in sql
+    assert "ST_DWithin(geography(places.location)" in sql
+    assert "LIMIT" in sql
+    # distance_m идет перед служебной колонкой updated_at
+    assert [column.name for column in query.selected_columns][-2:] == ["distance_m", "updated_at"]
+    print("✅ test_nearest_places пройден")
+
+def test_nearest_places_without_radius():
+    """Тест поиска ближайших мест без ограничения расстояния"""
+    sql = compile_sql(nearest_places(place_columns(Place), Place.location, 53.2, 50.1, k=5))
+
+    assert "ST_DWithin" not in sql
+    print("✅ test_nearest_places_without_radius пройден")
+
+def test_parse_bbox():
+    """Тест разбора bbox"""
+    assert parse_bbox("50.0,53.1,50.3,53.3") == (53.1, 53.3, 50.0, 50.3)
+    with pytest.raises(ValueError):
+        parse_bbox("50.0,53.1,50.3")
+    print("✅ test_parse_bbox пройден")
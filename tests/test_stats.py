@@ -0,0 +1,72 @@
+import asyncio
+import sys
+import os
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.stats import StatsCollector, check_database
+
+class LocalResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalar(self):
+        return self.rows[0][0]
+
+class LocalSession:
+    """Сессия, отвечающая заранее заданными строками и запоминающая запросы"""
+
+    statements = []
+
+    def __init__(self, estimates=None, fail=False):
+        self.estimates = estimates or []
+        self.fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        if self.fail:
+            raise ConnectionError("БД недоступна")
+        sql = str(statement)
+        LocalSession.statements.append(sql)
+        if "pg_class" in sql:
+            return LocalResult(self.estimates)
+        return LocalResult([(3,)])
+
+def test_stats_refresh():
+    """Тест статистики: оценка из pg_class, COUNT(*) только без статистики"""
+    LocalSession.statements = []
+
+    async def active_sessions():
+        return 7
+
+    stats = StatsCollector(
+        lambda: LocalSession(estimates=[("places", 120000), ("users", -1)]),
+        {"users_count": "users", "places_count": "places"},
+        {"active_sessions": active_sessions}
+    )
+    assert stats.snapshot()["places_count"] is None
+
+    asyncio.run(stats.refresh())
+
+    snapshot = stats.snapshot()
+    assert snapshot["places_count"] == 120000
+    assert snapshot["users_count"] == 3
+    assert snapshot["active_sessions"] == 7
+    assert snapshot["updated_at"] is not None
+    assert [sql for sql in LocalSession.statements if "count(*)" in sql] == ["SELECT count(*) FROM users"]
+    print("✅ test_stats_refresh пройден")
+
+def test_check_database():
+    """Тест проверки подключения к БД"""
+    assert asyncio.run(check_database(LocalSession)) is True
+    assert asyncio.run(check_database(lambda: LocalSession(fail=True))) is False
+    print("✅ test_check_database пройден")
@@ -0,0 +1,119 @@
+import sys
+import time
+import os
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from app.tiles import tile_for_point, tiles_for_point, tile_in_range, tile_path, invalidate_point, load_tile
+
+def test_tile_for_point():
+    """Тест вычисления тайла для точки"""
+    assert tile_for_point(50.1, 53.2, 0) == (0, 0)
+    # Самара на 10-м масштабе
+    assert tile_for_point(50.101801, 53.195533, 10) == (654, 332)
+    print("✅ test_tile_for_point пройден")
+
+def test_tile_in_range():
+    """Тест проверки координат тайла"""
+    assert tile_in_range(0, 0, 0)
+    assert tile_in_range(3, 7, 7)
+    assert not tile_in_range(3, 8, 0)
+    assert not tile_in_range(-1, 0, 0)
+    print("✅ test_tile_in_range пройден")
+
+def test_invalidate_point(tmp_path):
+    """Тест сброса кэша тайлов при добавлении места"""
+    cache_dir = str(tmp_path)
+    x, y = tile_for_point(50.1, 53.2, 12)
+    cached = tile_path(cache_dir, 12, x, y)
+    other = tile_path(cache_dir, 12, x + 1, y)
+    for path in (cached, other):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+
+    invalidate_point(cache_dir, 50.1, 53.2)
+
+    assert not os.path.exists(cached)
+    assert os.path.exists(other)
+    print("✅ test_invalidate_point пройден")
+
+def test_tiles_for_point_buffer():
+    """Тест: точка у края попадает и в соседние тайлы через буфер MVT"""
+    # Центр тайла 654/332 на 10-м масштабе - только он сам
+    center = (654.5 / 1024 * 360 - 180, 53.19)
+    assert tiles_for_point(*center, 10) == {tile_for_point(*center, 10)}
+    # У левого края тайла - еще и соседний слева
+    edge_lon = 654.01 / 1024 * 360 - 180
+    x, y = tile_for_point(edge_lon, 53.19, 10)
+    assert x == 654
+    assert tiles_for_point(edge_lon, 53.19, 10) >= {(654, y), (653, y)}
+    # На краю мира соседей нет
+    assert tiles_for_point(-179.99, 0.0, 1) == {(0, 0), (0, 1)}
+    print("✅ test_tiles_for_point_buffer пройден")
+
+def test_invalidate_point_neighbours(tmp_path):
+    """Тест: сброс точки у края тайла удаляет и соседний тайл"""
+    cache_dir = str(tmp_path)
+    edge_lon = 654.01 / 1024 * 360 - 180
+    x, y = tile_for_point(edge_lon, 53.19, 10)
+    neighbour = tile_path(cache_dir, 10, x - 1, y)
+    os.makedirs(os.path.dirname(neighbour), exist_ok=True)
+    open(neighbour, "wb").close()
+
+    invalidate_point(cache_dir, edge_lon, 53.19)
+
+    assert not os.path.exists(neighbour)
+    print("✅ test_invalidate_point_neighbours пройден")
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+    def scalar(self):
+        return self.data
+
+class FakeSession:
+    """Сессия БД, которая во время построения тайла выполняет on_execute"""
+
+    def __init__(self, on_execute=None):
+        self.on_execute = on_execute
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params):
+        if self.on_execute:
+            self.on_execute()
+        return FakeResult(b"tile")
+
+def test_load_tile_skips_write_after_invalidation(tmp_path):
+    """Тест: тайл, построенный во время сброса кэша, не сохраняется"""
+    cache_dir = str(tmp_path)
+    x, y = tile_for_point(50.1, 53.2, 12)
+    factory = lambda: FakeSession(lambda: invalidate_point(cache_dir, 50.1, 53.2))
+
+    assert asyncio.run(load_tile(factory, cache_dir, 12, x, y)) == b"tile"
+    assert not os.path.exists(tile_path(cache_dir, 12, x, y))
+
+    asyncio.run(load_tile(FakeSession, cache_dir, 12, x, y))
+    assert os.path.exists(tile_path(cache_dir, 12, x, y))
+    print("✅ test_load_tile_skips_write_after_invalidation пройден")
+
+def test_load_tile_max_age(tmp_path):
+    """Тест: устаревший тайл на диске строится заново"""
+    cache_dir = str(tmp_path)
+    path = tile_path(cache_dir, 3, 1, 1)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"old")
+    old = time.time() - 3600
+    os.utime(path, (old, old))
+
+    assert asyncio.run(load_tile(FakeSession, cache_dir, 3, 1, 1, max_age=7200)) == b"old"
+    assert asyncio.run(load_tile(FakeSession, cache_dir, 3, 1, 1, max_age=60)) == b"tile"
+    print("✅ test_load_tile_max_age пройден")
@@ -0,0 +1,50 @@
+import asyncio
+import sys
+import os
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.sessions import MemorySessionStore
+from app.tokens import TokenDenylist, is_signed_token, sign_token, verify_token
+
+SECRET = "test-secret"
+
+def test_sign_and_verify():
+    """Тест подписи и проверки токена"""
+    token = sign_token(SECRET, 7, "Волжанин")
+    assert is_signed_token(token)
+
+    claims = verify_token(SECRET, token)
+    assert claims["uid"] == 7
+    assert claims["name"] == "Волжанин"
+
+    assert verify_token("other-secret", token) is None
+    body, signature = token.split(".")
+    assert verify_token(SECRET, body[:-2] + "xx." + signature) is None
+    assert verify_token(SECRET, "not-a-token") is None
+    assert verify_token(SECRET, sign_token(SECRET, 7, "Волжанин", ttl=-10)) is None
+    print("✅ test_sign_and_verify пройден")
+
+def test_verify_non_ascii_token():
+    """Тест: токен с не-ASCII символами отклоняется, а не вызывает ошибку"""
+    assert verify_token(SECRET, "a.ы") is None
+    assert verify_token(SECRET, "данные.подпись") is None
+    token = sign_token(SECRET, 7, "Волжанин")
+    assert verify_token(SECRET, token + "ы") is None
+    print("✅ test_verify_non_ascii_token пройден")
+
+def test_denylist():
+    """Тест отзыва токена при выходе"""
+    async def scenario():
+        denylist = TokenDenylist(MemorySessionStore())
+        claims = verify_token(SECRET, sign_token(SECRET, 1, "user"))
+        other = verify_token(SECRET, sign_token(SECRET, 1, "user"))
+
+        assert not await denylist.is_revoked(claims)
+        await denylist.revoke(claims)
+        assert await denylist.is_revoked(claims)
+        assert not await denylist.is_revoked(other)
+
+    asyncio.run(scenario())
+    print("✅ test_denylist пройден")
@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+import io
+import pytest
+import sys
+import os
+
+# Добавляем путь к проекту
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import UploadFile, HTTPException
+from app.uploads import save_upload_file, acquire_photo, upload_tmp_dir
+
+def test_save_upload_file(tmp_path):
+    """Тест потокового сохранения фото"""
+    data = b"x" * 3000
+    upload = UploadFile(io.BytesIO(data), filename="photo.jpg")
+
+    filename = asyncio.run(save_upload_file(upload, str(tmp_path), max_size=10000))
+
+    digest = hashlib.sha256(data).hexdigest()
+    assert filename == os.path.join(digest[:2], digest[2:4], f"{digest}.jpg")
+    assert (tmp_path / filename).read_bytes() == data
+    print("✅ test_save_upload_file пройден")
+
+def test_save_upload_file_deduplicates(tmp_path):
+    """Тест: повторная загрузка того же фото не создает второй файл"""
+    data = b"same photo"
+    first = asyncio.run(save_upload_file(UploadFile(io.BytesIO(data), filename="a.JPG"), str(tmp_path), 1000))
+    second = asyncio.run(save_upload_file(UploadFile(io.BytesIO(data), filename="b.jpg"), str(tmp_path), 1000))
+
+    assert first == second
+    stored = [path for path in tmp_path.rglob("*") if path.is_file()]
+    assert len(stored) == 1
+    print("✅ test_save_upload_file_deduplicates пройден")
+
+def test_save_upload_file_too_large(tmp_path):
+    """Тест отказа на слишком большом файле"""
+    upload = UploadFile(io.BytesIO(b"x" * 3000), filename="photo.jpg")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(save_upload_file(upload, str(tmp_path), max_size=1000))
+
+    assert error.value.status_code == 413
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
+    print("✅ test_save_upload_file_too_large пройден")
+
+def test_upload_tmp_dir_outside_static(tmp_path):
+    """Тест: недописанные файлы лежат вне раздаваемого каталога"""
+    upload_dir = str(tmp_path / "uploads")
+    tmp_dir = upload_tmp_dir(upload_dir + "/")
+
+    assert tmp_dir == upload_dir + ".tmp"
+    assert os.path.commonpath([upload_dir, tmp_dir]) != upload_dir
+
+    asyncio.run(save_upload_file(UploadFile(io.BytesIO(b"photo"), filename="a.jpg"), upload_dir, 1000))
+    assert os.listdir(tmp_dir) == []
+    print("✅ test_upload_tmp_dir_outside_static пройден")
+
+class RecordingSession:
+    """Сессия БД, запоминающая выполненные команды"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+
+def test_acquire_photo_missing_file(tmp_path):
+    """Тест: ссылка на удаленный параллельным запросом файл не создается"""
+    db = RecordingSession()
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(acquire_photo(db, "ab/cd/abcd.jpg", str(tmp_path)))
+
+    assert error.value.status_code == 409
+    assert len(db.statements) == 1
+    assert "pg_advisory_xact_lock" in db.statements[0]
+    print("✅ test_acquire_photo_missing_file пройден")
+
+def test_upload_limit_middleware():
+    """Тест: большое тело отклоняется до чтения формы"""
+    from fastapi import FastAPI, File
+    from fastapi.testclient import TestClient
+    from app.uploads import UploadLimitMiddleware
+
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, limits={"/upload": 1000})
+
+    @app.post("/upload")
+    async def upload(photo: UploadFile = File(...)):
+        return {"size": len(await photo.read())}
+
+    client = TestClient(app)
+    assert client.post("/upload", files={"photo": ("a.jpg", b"x" * 100)}).json() == {"size": 100}
+    assert client.post("/upload", files={"photo": ("a.jpg", b"x" * 3000)}).status_code == 413
+
+    def chunks():
+        yield b"x" * 800
+        yield b"x" * 800
+    response = client.post("/upload", content=chunks(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    print("✅ test_upload_limit_middleware пройден")